@@ -0,0 +1,186 @@
+"""
+Benchmarks of the command hot path of CleaningRobot against the mock backend.
+
+Usage:
+    python -m benchmarks.bench_cleaning_robot [--output results.json] [--baseline baseline.json] [--tolerance 0.3]
+
+Every benchmark reports its median throughput (ops/sec) and the peak memory traced during one operation. With
+--baseline, the results are compared with a previous --output file and the script exits with status 1 if any
+benchmark got slower than the tolerance allows. The comparison uses the throughput relative to a reference workload
+timed alongside, so that it holds on machines whose speed varies from run to run; baselines saved before this
+measure existed are compared by raw throughput instead.
+"""
+import argparse
+import json
+import statistics
+import sys
+import timeit
+import tracemalloc
+from typing import Callable, Iterator, Tuple
+from unittest.mock import patch
+
+from mock import GPIO
+from mock.ibs import IBS
+from src.cleaning_robot import CleaningRobot
+
+# Minimum duration of a timed sample, and number of samples whose median is kept
+MIN_SAMPLE_TIME = 0.05
+REPEAT = 15
+
+
+def reference() -> None:
+    """
+    Fixed pure-Python workload timed along with every benchmark, to factor out the speed of the machine
+    """
+    total = 0
+    for i in range(100):
+        total += i
+
+
+def calibrate(timer: timeit.Timer) -> int:
+    """
+    Returns how many calls make a sample last at least MIN_SAMPLE_TIME seconds
+    """
+    number = 1
+    while timer.timeit(number) < MIN_SAMPLE_TIME:
+        number *= 2
+    return number
+
+
+def measure(func: Callable[[], None]) -> dict:
+    """
+    Times func timeit-style, in batches of calls lasting at least MIN_SAMPLE_TIME seconds. Every sample is paired
+    with a sample of reference(), taken right after it: the median ratio of the two throughputs ("relative")
+    barely moves when the machine gets faster or slower, unlike the throughput itself. "peak_bytes" is the peak
+    memory traced by tracemalloc during a single call
+    """
+    timer = timeit.Timer(func)
+    reference_timer = timeit.Timer(reference)
+    number = calibrate(timer)
+    reference_number = calibrate(reference_timer)
+    samples = []
+    ratios = []
+    for _ in range(REPEAT):
+        ops_per_sec = number / timer.timeit(number)
+        samples.append(ops_per_sec)
+        ratios.append(ops_per_sec / (reference_number / reference_timer.timeit(reference_number)))
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"ops_per_sec": statistics.median(samples), "relative": statistics.median(ratios), "peak_bytes": peak}
+
+
+def new_robot() -> CleaningRobot:
+    robot = CleaningRobot()
+    robot.initialize_robot()
+    return robot
+
+
+def execute_command_forward() -> Callable[[], None]:
+    robot = new_robot()
+
+    def forward():
+        # Moving back to the origin is a couple of attribute writes, negligible next to the command
+        robot.pos_x = 0
+        robot.pos_y = 0
+        robot.execute_command(robot.FORWARD)
+    return forward
+
+
+def execute_command(command: str) -> Callable[[], None]:
+    robot = new_robot()
+    return lambda: robot.execute_command(command)
+
+
+def go_to_recharge_station(distance: int, heading: str) -> Callable[[], None]:
+    robot = new_robot()
+
+    def go():
+        robot.pos_x = distance
+        robot.pos_y = distance
+        robot.heading = heading
+        robot.go_to_recharge_station()
+    return go
+
+
+def manage_cleaning_system() -> Callable[[], None]:
+    return new_robot().manage_cleaning_system
+
+
+def benchmarks() -> Iterator[Tuple[str, Callable[[], Callable[[], None]]]]:
+    """
+    Yields the name of every benchmark with a factory of the operation to time; every benchmark gets its own robot,
+    so none of them depends on the state left behind by another
+    """
+    yield "execute_command_forward", execute_command_forward
+    yield "execute_command_left", lambda: execute_command(CleaningRobot.LEFT)
+    yield "execute_command_right", lambda: execute_command(CleaningRobot.RIGHT)
+    for distance in (1, 5, 20):
+        for heading in (CleaningRobot.N, CleaningRobot.E, CleaningRobot.S, CleaningRobot.W):
+            yield (f"go_to_recharge_station_{distance}_{heading}",
+                   lambda distance=distance, heading=heading: go_to_recharge_station(distance, heading))
+    yield "manage_cleaning_system", manage_cleaning_system
+    yield "gpio_output", lambda: lambda: GPIO.output(CleaningRobot.AIN1, GPIO.HIGH)
+    yield "gpio_output_grouped", lambda: lambda: GPIO.output(CleaningRobot.WHEEL_MOTOR_PINS, GPIO.LOW)
+    yield "gpio_input", lambda: lambda: GPIO.input(CleaningRobot.INFRARED_PIN)
+
+
+def run_benchmarks() -> dict:
+    results = {}
+    with patch.object(IBS, "get_charge_left", return_value=100):
+        for name, factory in benchmarks():
+            results[name] = measure(factory())
+    return results
+
+
+def speedup(result: dict, baseline: dict) -> float:
+    """
+    Returns the ratio of the throughput of a benchmark to its baseline, relative to the reference workload
+    unless the baseline predates it
+    """
+    if "relative" in baseline:
+        return result["relative"] / baseline["relative"]
+    return result["ops_per_sec"] / baseline["ops_per_sec"]
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Returns the names of the benchmarks whose throughput dropped by more than tolerance with respect to the baseline
+    """
+    return [name for name, result in results.items()
+            if name in baseline and speedup(result, baseline[name]) < 1 - tolerance]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--output", help="file where the results are saved as JSON")
+    parser.add_argument("--baseline", help="JSON results of a previous run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="allowed throughput drop (default: 0.3)")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks()
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    for name, result in results.items():
+        line = f"{name:40} {result['ops_per_sec']:14.1f} ops/sec {result['peak_bytes']:8d} B peak"
+        if name in baseline:
+            line += f" ({speedup(result, baseline[name]) - 1:+.1%})"
+        print(line)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    regressions = compare(results, baseline, args.tolerance)
+    for name in regressions:
+        print(f"REGRESSION: {name}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
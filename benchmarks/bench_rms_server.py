@@ -0,0 +1,71 @@
+"""
+Throughput benchmark of the RMS server against the mock backend.
+
+Usage:
+    python -m benchmarks.bench_rms_server [--unix] [--commands 20000] [--batch 100] [--window 16]
+
+The client keeps up to --window batches of --batch commands in flight on a single persistent connection,
+and the benchmark reports how many commands per second the server executes and answers.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+from mock.ibs import IBS
+from src.async_cleaning_robot import AsyncCleaningRobot
+from src.rms_server import RMSClient, RMSServer
+
+# A closed loop, so the robot never leaves the area around the recharge station
+BATCH_PATTERN = 'frfrfrfr'
+
+
+async def run_benchmark(commands: int, batch: int, window: int, path: str = None) -> dict:
+    robot = AsyncCleaningRobot()
+    robot.initialize_robot()
+    server = await RMSServer(robot).start(path)
+    port = None if path is not None else server.sockets[0].getsockname()[1]
+    client = await RMSClient.connect(path, port=port)
+
+    request = (BATCH_PATTERN * (batch // len(BATCH_PATTERN) + 1))[:batch]
+    batches = commands // batch
+    statuses = 0
+    start = time.perf_counter()
+    in_flight = 0
+    for _ in range(batches):
+        await client.send(request)
+        in_flight += 1
+        if in_flight == window:
+            statuses += len(await client.receive())
+            in_flight -= 1
+    for _ in range(in_flight):
+        statuses += len(await client.receive())
+    elapsed = time.perf_counter() - start
+
+    await client.close()
+    server.close()
+    await server.wait_closed()
+    return {"commands_per_sec": statuses / elapsed, "statuses": statuses, "elapsed": elapsed}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--unix", action="store_true", help="use a Unix socket instead of TCP on localhost")
+    parser.add_argument("--commands", type=int, default=20000, help="commands to send (default: 20000)")
+    parser.add_argument("--batch", type=int, default=100, help="commands per request (default: 100)")
+    parser.add_argument("--window", type=int, default=16, help="requests in flight (default: 16)")
+    args = parser.parse_args(argv)
+
+    with patch.object(IBS, "get_charge_left", return_value=100), tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "rms.sock") if args.unix else None
+        result = asyncio.run(run_benchmark(args.commands, args.batch, args.window, path))
+    print(f"{'unix' if args.unix else 'tcp'} batch={args.batch} window={args.window}: "
+          f"{result['commands_per_sec']:.1f} commands/sec ({result['statuses']} statuses in {result['elapsed']:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,7 @@ Mock Library for RPi.GPIO
 
 import logging
 import os
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +54,22 @@ _mode = 0
 
 channel_config = {}
 
+# State of every BOARD pin (1-40), indexed by pin number
+channel_state = bytearray(41)
+
+# Values scripted to be returned by the next reads of an input channel
+scripted_inputs = {}
+
+class EventDetect:
+    def __init__(self, edge, bouncetime):
+        self.edge = edge
+        self.bouncetime = bouncetime
+        self.callbacks = []
+        self.detected = False
+
+# Edge detection enabled on each channel
+event_detects = {}
+
 #flags
 setModeDone = False
 
@@ -72,12 +89,14 @@ def setmode(mode):
     BCM   - Use Broadcom GPIO 00..nn numbers
     """
     # GPIO = GPIO()
+    global _mode, setModeDone
     if(mode == BCM):
         setModeDone = True
         _mode = mode
 
     elif (mode == BOARD):
         setModeDone = True
+        _mode = mode
     else:
         setModeDone = False
 
@@ -92,7 +111,7 @@ def setwarnings(flag):
     """
     Enable or disable warning messages
     """
-    logger.info("Set warnings as {}".format(flag))
+    logger.info("Set warnings as %s", flag)
 
 def setup(channel, direction, initial=0,pull_up_down=PUD_OFF):
     """
@@ -103,7 +122,7 @@ def setup(channel, direction, initial=0,pull_up_down=PUD_OFF):
     [initial]      - Initial value for an output channel
 
     """
-    logger.info("Setup channel : {} as {} with initial :{} and pull_up_down {}".format(channel,direction,initial,pull_up_down))
+    logger.info("Setup channel : %s as %s with initial :%s and pull_up_down %s", channel,direction,initial,pull_up_down)
     global channel_config
     channel_config[channel] = Channel(channel, direction, initial, pull_up_down)
 
@@ -114,14 +133,57 @@ def output(channel, value):
     value   - 0/1 or False/True or LOW/HIGH
 
     """
-    logger.info("Output channel : {} with value : {}".format(channel, value))
+    logger.info("Output channel : %s with value : %s", channel, value)
+    if isinstance(channel, (list, tuple)):
+        if isinstance(value, (list, tuple)):
+            if len(value) != len(channel):
+                raise RuntimeError("Number of channels != number of values")
+            for pin, pin_value in zip(channel, value):
+                channel_state[pin] = pin_value
+        else:
+            for pin in channel:
+                channel_state[pin] = value
+    else:
+        channel_state[channel] = value
 
 def input(channel):
     """
     Input from a GPIO channel.  Returns HIGH=1=True or LOW=0=False
     channel - either board pin number or BCM number depending on which mode is set.
     """
-    logger.info("Reading from channel {}".format(channel))
+    logger.info("Reading from channel %s", channel)
+    if channel in scripted_inputs:
+        value = next(scripted_inputs[channel], None)
+        if value is not None:
+            channel_state[channel] = value
+            return value
+        del scripted_inputs[channel]
+    return channel_state[channel]
+
+def set_input(channel, value):
+    """
+    Simulate the level of an input channel, returned by all the next reads
+    channel - either board pin number or BCM number depending on which mode is set.
+    value   - 0/1 or False/True or LOW/HIGH
+    """
+    scripted_inputs.pop(channel, None)
+    channel_state[channel] = value
+
+def script_input(channel, values):
+    """
+    Script the values returned by the next reads of an input channel; once they are over, the channel keeps its last value
+    channel - either board pin number or BCM number depending on which mode is set.
+    values  - an iterable of 0/1 or False/True or LOW/HIGH
+    """
+    scripted_inputs[channel] = iter(values)
+
+def reset():
+    """
+    Reset the state of every channel to LOW and drop the scripted inputs and the edge detections
+    """
+    channel_state[:] = bytes(len(channel_state))
+    scripted_inputs.clear()
+    event_detects.clear()
 
 def wait_for_edge(channel,edge,bouncetime,timeout):
     """
@@ -131,10 +193,10 @@ def wait_for_edge(channel,edge,bouncetime,timeout):
     [bouncetime] - time allowed between calls to allow for switchbounce
     [timeout]    - timeout in ms
     """
-    logger.info("Waiting for edge : {} on channel : {} with bounce time : {} and Timeout :{}".format(edge,channel,bouncetime,timeout))
+    logger.info("Waiting for edge : %s on channel : %s with bounce time : %s and Timeout :%s", edge,channel,bouncetime,timeout)
 
 
-def add_event_detect(channel,edge,callback,bouncetime):
+def add_event_detect(channel,edge,callback=None,bouncetime=None):
     """
     Enable edge detection events for a particular GPIO channel.
     channel      - either board pin number or BCM number depending on which mode is set.
@@ -142,14 +204,24 @@ def add_event_detect(channel,edge,callback,bouncetime):
     [callback]   - A callback function for the event (optional)
     [bouncetime] - Switch bounce timeout in ms for callback
     """
-    logger.info("Event detect added for edge : {} on channel : {} with bounce time : {} and callback {}".format(edge,channel,bouncetime,callback))
+    logger.info("Event detect added for edge : %s on channel : %s with bounce time : %s and callback %s", edge,channel,bouncetime,callback)
+    if channel in event_detects:
+        raise RuntimeError("Conflicting edge detection already enabled for this GPIO channel")
+    event_detects[channel] = EventDetect(edge, bouncetime)
+    if callback is not None:
+        event_detects[channel].callbacks.append(callback)
 
 def event_detected(channel):
     """
     Returns True if an edge has occurred on a given GPIO.  You need to enable edge detection using add_event_detect() first.
     channel - either board pin number or BCM number depending on which mode is set.
     """
-    logger.info("Waiting for even detection on channel :{}".format(channel))
+    logger.info("Waiting for even detection on channel :%s", channel)
+    event = event_detects.get(channel)
+    if event is None or not event.detected:
+        return False
+    event.detected = False
+    return True
 
 def add_event_callback(channel,callback):
     """
@@ -157,21 +229,43 @@ def add_event_callback(channel,callback):
     channel      - either board pin number or BCM number depending on which mode is set.
     callback     - a callback function
     """
-    logger.info("Event callback : {} added for channel : {}".format(callback,channel))
+    logger.info("Event callback : %s added for channel : %s", callback,channel)
+    if channel not in event_detects:
+        raise RuntimeError("Add event detection using add_event_detect first before adding a callback")
+    event_detects[channel].callbacks.append(callback)
 
 def remove_event_detect(channel):
     """
     Remove edge detection for a particular GPIO channel
     channel - either board pin number or BCM number depending on which mode is set.
     """
-    logger.info("Event detect removed for channel : {}".format(channel))
+    logger.info("Event detect removed for channel : %s", channel)
+    event_detects.pop(channel, None)
+
+def fire_edge(channel, value):
+    """
+    Simulate a change of level of an input channel: if edge detection is enabled on the channel and the change
+    matches its edge, the event is detected and the callbacks are called (in the calling thread)
+    channel - either board pin number or BCM number depending on which mode is set.
+    value   - the new level, 0/1 or False/True or LOW/HIGH
+    """
+    logger.info("Firing edge to value : %s on channel : %s", value, channel)
+    previous = channel_state[channel]
+    set_input(channel, value)
+    event = event_detects.get(channel)
+    if event is None or bool(previous) == bool(value):
+        return
+    if event.edge == BOTH or event.edge == (RISING if value else FALLING):
+        event.detected = True
+        for callback in list(event.callbacks):
+            callback(channel)
 
 def gpio_function(channel):
     """
     Return the current GPIO function (IN, OUT, PWM, SERIAL, I2C, SPI)
     channel - either board pin number or BCM number depending on which mode is set.
     """
-    logger.info("GPIO function of channel : {} is {}".format(channel,channel_config[channel].direction))
+    logger.info("GPIO function of channel : %s is %s", channel,channel_config[channel].direction)
 
 
 class PWM:
@@ -183,9 +277,12 @@ class PWM:
         self.channel = channel
         self.frequency = frequency
         self.dutycycle = 0
+        # (time, duty cycle) pairs recording every change of the duty cycle; set timer to record another clock
+        self.timeline = []
+        self.timer = time.monotonic
         global channel_config
         channel_config[channel] = Channel(channel,PWM,)
-        logger.info("Initialized PWM for channel : {} at frequency : {}".format(channel,frequency))
+        logger.info("Initialized PWM for channel : %s at frequency : %s", channel,frequency)
 
     # where dc is the duty cycle (0.0 <= dc <= 100.0)
     def start(self, dutycycle):
@@ -193,8 +290,8 @@ class PWM:
         Start software PWM
         dutycycle - the duty cycle (0.0 to 100.0)
         """
-        self.dutycycle = dutycycle
-        logger.info("Start pwm on channel : {} with duty cycle : {}".format(self.channel,dutycycle))
+        self._record(dutycycle)
+        logger.info("Start pwm on channel : %s with duty cycle : %s", self.channel,dutycycle)
 
     # where freq is the new frequency in Hz
     def ChangeFrequency(self, frequency):
@@ -202,7 +299,7 @@ class PWM:
         Change the frequency
         frequency - frequency in Hz (freq > 1.0)
         """
-        logger.info("Freqency changed for channel : {} from : {} -> to : {}".format(self.channel,self.frequency,frequency))
+        logger.info("Freqency changed for channel : %s from : %s -> to : %s", self.channel,self.frequency,frequency)
         self.frequency = frequency
 
     # where 0.0 <= dc <= 100.0
@@ -211,12 +308,25 @@ class PWM:
         Change the duty cycle
         dutycycle - between 0.0 and 100.0
         """
-        self.dutycycle = dutycycle
-        logger.info("Dutycycle changed for channel : {} from : {} -> to : {}".format(self.channel,self.dutycycle,dutycycle))
+        if not 0.0 <= dutycycle <= 100.0:
+            raise ValueError("dutycycle must have a value from 0.0 to 100.0")
+        logger.info("Dutycycle changed for channel : %s from : %s -> to : %s", self.channel,self.dutycycle,dutycycle)
+        self._record(dutycycle)
 
     # stop PWM generation
     def stop(self):
-        logger.info("Stop PWM on channel : {} with duty cycle : {}".format(self.channel,self.dutycycle))
+        logger.info("Stop PWM on channel : %s with duty cycle : %s", self.channel,self.dutycycle)
+        self._record(0)
+
+    def dutycycles(self):
+        """
+        Return the sequence of duty cycles applied so far, without their times
+        """
+        return [dutycycle for _, dutycycle in self.timeline]
+
+    def _record(self, dutycycle):
+        self.dutycycle = dutycycle
+        self.timeline.append((self.timer(), dutycycle))
 
 
 def cleanup(channel=None):
@@ -225,6 +335,6 @@ def cleanup(channel=None):
     [channel] - individual channel or list/tuple of channels to clean up.  Default - clean every channel that has been used.
     """
     if channel is not None:
-        logger.info("Cleaning up channel : {}".format(channel))
+        logger.info("Cleaning up channel : %s", channel)
     else:
         logger.info("Cleaning up all channels")
\ No newline at end of file
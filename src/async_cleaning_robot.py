@@ -0,0 +1,138 @@
+import asyncio
+from typing import AsyncIterator, Iterable
+
+import src.cleaning_robot as cleaning_robot
+from src.cleaning_robot import CleaningRobot, CleaningRobotError
+from src.command_result import CommandResult
+
+
+class AsyncCleaningRobot(CleaningRobot):
+    """
+    CleaningRobot whose commands are coroutines: the motors run on asyncio timers instead of blocking the
+    process with time.sleep, so the same event loop can monitor the sensors and serve the RMS meanwhile
+    """
+
+    # How often the infrared sensor is checked while the wheel motor is running
+    OBSTACLE_POLL_INTERVAL = 0.05
+
+    async def execute_command(self, command: str) -> str:
+        return str(await self.execute(command))
+
+    async def execute(self, command: str) -> CommandResult:
+        charge_left = self.battery.get_charge_left()
+        if charge_left <= 10:
+            return self.refuse_command(command)
+        if charge_left <= 24 and not self.goingBackToRechargeStation:
+            self.goingBackToRechargeStation = True
+            await self.go_to_recharge_station()
+            return self.result()
+        return await self.perform_command(command)
+
+    async def execute_commands(self, commands: Iterable[str], battery_check_window: int = 1) -> AsyncIterator[str]:
+        """
+        Asynchronous counterpart of CleaningRobot.execute_commands
+        """
+        async for result in self.execute_stream(commands, battery_check_window):
+            yield str(result)
+
+    async def execute_stream(self, commands: Iterable[str],
+                             battery_check_window: int = 1) -> AsyncIterator[CommandResult]:
+        if battery_check_window < 1:
+            raise CleaningRobotError()
+        if self.optimizer is not None:
+            commands = self.optimizer.stream(commands)
+        for i, command in enumerate(commands):
+            if i % battery_check_window == 0:
+                charge_left = self.battery.get_charge_left()
+                if charge_left <= 10:
+                    yield self.refuse_command(command)
+                    return
+                if charge_left <= 24 and not self.goingBackToRechargeStation:
+                    self.goingBackToRechargeStation = True
+                    await self.go_to_recharge_station()
+                    yield self.result()
+                    return
+            yield await self.perform_command(command)
+
+    async def perform_command(self, command: str) -> CommandResult:
+        if command == self.FORWARD:
+            await self.activate_wheel_motor()
+            result = self.move_forward()
+        else:
+            self.rotate(command)
+            await self.activate_rotation_motor(command)
+            result = self.result()
+        if self.journal is not None:
+            self.record_command(command, result)
+        return result
+
+    async def go_to_recharge_station(self):
+        self.goingBackToRechargeStation = True
+        while (self.pos_x, self.pos_y, self.heading) != (0, 0, self.E):
+            for command in self.plan_route_to_recharge_station():
+                result = await self.execute(command)
+                if result.low_battery:
+                    raise CleaningRobotError("battery too low to reach the recharge station")
+                if result.obstacle is not None:
+                    break
+
+    async def activate_wheel_motor(self) -> None:
+        """
+        Let the robot move forward by activating its wheel motor; the motor is stopped early as soon as
+        the infrared sensor detects an obstacle
+        """
+        if self.clock.virtual:  # Simulated time passes instantly, there is nothing to await
+            return super().activate_wheel_motor()
+        await self.start_wheel_motor_async()
+        if cleaning_robot.DEPLOYMENT:
+            cell_time = self.wheel_cell_time()
+            elapsed = 0.0
+            while elapsed < cell_time and not self.obstacle_found(fresh=True):
+                await asyncio.sleep(min(self.OBSTACLE_POLL_INTERVAL, cell_time - elapsed))
+                elapsed += self.OBSTACLE_POLL_INTERVAL
+        await self.stop_wheel_motor_async()
+
+    async def activate_rotation_motor(self, direction) -> None:
+        if self.clock.virtual:
+            return super().activate_rotation_motor(direction)
+        await self.start_rotation_motor_async(direction)
+        if cleaning_robot.DEPLOYMENT:
+            await asyncio.sleep(self.MOTOR_ACTIVATION_TIME)
+        await self.stop_rotation_motor_async()
+
+    async def start_wheel_motor_async(self) -> None:
+        """
+        Same as start_wheel_motor, but the speed ramp awaits between its steps instead of blocking the event loop
+        """
+        if self.wheel_pwm is None:
+            return self.start_wheel_motor()
+        self.engage_wheel_motor()
+        await self.ramp_async(self.wheel_pwm, self.wheel_profile.ramp_up, self.wheel_profile.step_time)
+        self.set_wheel_speed(self.wheel_profile.cruise)
+
+    async def stop_wheel_motor_async(self) -> None:
+        if self.wheel_pwm is None:
+            return self.stop_wheel_motor()
+        await self.ramp_async(self.wheel_pwm, self.wheel_profile.ramp_down, self.wheel_profile.step_time)
+        self.set_wheel_speed(0)
+        self.release_wheel_motor()
+
+    async def start_rotation_motor_async(self, direction) -> None:
+        if self.rotation_pwm is None:
+            return self.start_rotation_motor(direction)
+        self.engage_rotation_motor(direction)
+        await self.ramp_async(self.rotation_pwm, self.rotation_profile.ramp_up, self.rotation_profile.step_time)
+        self.rotation_pwm.ChangeDutyCycle(self.rotation_profile.cruise)
+
+    async def stop_rotation_motor_async(self) -> None:
+        if self.rotation_pwm is None:
+            return self.stop_rotation_motor()
+        await self.ramp_async(self.rotation_pwm, self.rotation_profile.ramp_down, self.rotation_profile.step_time)
+        self.rotation_pwm.ChangeDutyCycle(0)
+        self.release_rotation_motor()
+
+    async def ramp_async(self, pwm, duty_cycles, step_time: float) -> None:
+        for duty_cycle in duty_cycles:
+            pwm.ChangeDutyCycle(duty_cycle)
+            if cleaning_robot.DEPLOYMENT:
+                await asyncio.sleep(step_time)
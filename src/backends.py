@@ -0,0 +1,68 @@
+import importlib
+import importlib.util
+import os
+from typing import Dict, NamedTuple
+
+# Environment variable selecting the hardware backend: one of the registered names, or "auto"
+BACKEND_ENV = "CLEANING_ROBOT_BACKEND"
+
+
+class Backend(NamedTuple):
+    """
+    Names of the modules driving the GPIO pins, the I2C bus and the IBS; they are imported only once selected
+    """
+    gpio: str
+    board: str
+    ibs: str
+    deployment: bool
+
+
+class LoadedBackend(NamedTuple):
+    name: str
+    gpio: object
+    board: object
+    ibs: object
+    deployment: bool
+
+
+class BackendError(Exception):
+    pass
+
+
+BACKENDS: Dict[str, Backend] = {
+    "hardware": Backend("RPi.GPIO", "board", "IBS", deployment=True),
+    "mock": Backend("mock.GPIO", "mock.board", "mock.ibs", deployment=False),
+}
+
+
+def register_backend(name: str, backend: Backend) -> None:
+    BACKENDS[name] = backend
+
+
+def backend_name(name: str = None) -> str:
+    """
+    Resolves the name of the backend to use: the given one, else the one in the environment, else "auto".
+    "auto" chooses the hardware if the RPi package is installed (without importing it) and the mocks otherwise
+    """
+    if name is None:
+        name = os.environ.get(BACKEND_ENV, "auto")
+    if name == "auto":
+        name = "hardware" if importlib.util.find_spec("RPi") is not None else "mock"
+    if name not in BACKENDS:
+        raise BackendError(f"Unknown backend {name!r} (choose among {', '.join(sorted(BACKENDS))} or auto)")
+    return name
+
+
+def load_backend(name: str = None) -> LoadedBackend:
+    """
+    Imports the modules of the selected backend; unlike a silent fallback, a missing or broken driver is an error
+    """
+    name = backend_name(name)
+    backend = BACKENDS[name]
+    modules = []
+    for module in (backend.gpio, backend.board, backend.ibs):
+        try:
+            modules.append(importlib.import_module(module))
+        except ImportError as e:
+            raise BackendError(f"Cannot load backend {name!r}: importing {module} failed ({e})") from e
+    return LoadedBackend(name, *modules, backend.deployment)
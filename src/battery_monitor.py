@@ -0,0 +1,63 @@
+from src.clock import SystemClock
+
+
+class BatteryMonitor:
+    """
+    Caching layer between the robot and its IBS: every call to IBS.get_charge_left() is an I2C round trip,
+    so a reading is reused as long as it is younger than max_age seconds. Readings close to the recharge
+    thresholds are never reused, so the robot reacts to them exactly as if it was reading the IBS directly
+    """
+
+    LOW_BATTERY_THRESHOLD = 10
+    RECHARGE_THRESHOLD = 24
+
+    def __init__(self, ibs, max_age: float = 0.0, refresh_margin: int = 5, clock=None):
+        """
+        :param ibs: the IBS to read the charge left from
+        :param max_age: how long (in seconds) a reading can be reused; 0 disables caching
+        :param refresh_margin: readings within this margin from the recharge threshold are always refreshed
+        :param clock: the clock measuring the age of the readings (by default, a SystemClock)
+        """
+        self.ibs = ibs
+        self.clock = clock if clock is not None else SystemClock()
+        self.max_age = max_age
+        self.refresh_margin = refresh_margin
+
+        self.hits = 0
+        self.misses = 0
+
+        self._charge_left = None
+        self._read_at = None
+
+    def get_charge_left(self) -> int:
+        """
+        Returns the charge left, reading the IBS only if the cached value is too old or too close to a threshold
+        """
+        if self._charge_left is not None and not self.near_threshold(self._charge_left) \
+                and self.clock.now() - self._read_at < self.max_age:
+            self.hits += 1
+            return self._charge_left
+        return self.refresh()
+
+    def refresh(self) -> int:
+        """
+        Forces a read of the IBS and caches its value
+        """
+        self.misses += 1
+        self._charge_left = self.ibs.get_charge_left()
+        self._read_at = self.clock.now()
+        return self._charge_left
+
+    @property
+    def last_reading(self) -> int:
+        """
+        Returns the last charge read from the IBS, None if it has not been read yet
+        """
+        return self._charge_left
+
+    def invalidate(self) -> None:
+        self._charge_left = None
+        self._read_at = None
+
+    def near_threshold(self, charge_left: int) -> bool:
+        return charge_left <= self.RECHARGE_THRESHOLD + self.refresh_margin
@@ -1,17 +1,26 @@
-import time
-from getpass import win_getpass
+import threading
+from itertools import groupby, islice
+from typing import Iterable, Iterator, Tuple
 
-DEPLOYMENT = False  # This variable is to understand whether you are deploying on the actual hardware
+from src.backends import load_backend
+from src.battery_monitor import BatteryMonitor
+from src.clock import SystemClock
+from src.command_result import CommandResult
+from src.energy_model import EnergyModel
+from src.infrared_sensor import InfraredSensor
+from src.instrumentation import Instrumentation, InstrumentedGPIO, InstrumentedIBS
+from src.occupancy_grid import OccupancyGrid
+from src.robot_state import RobotState, HEADINGS, HEADING_CODES, DX, DY, TURN_LEFT, TURN_RIGHT
+from src.route_planner import apply_command, plan_route
+from src.speed_profile import SpeedProfile
+from src.trajectory import Trajectory, MOVED, BLOCKED, LEFT, RIGHT
 
-try:
-    import RPi.GPIO as GPIO
-    import board
-    import IBS
-    DEPLOYMENT = True
-except:
-    import mock.GPIO as GPIO
-    import mock.board as board
-    import mock.ibs as IBS
+# The backend is selected through the CLEANING_ROBOT_BACKEND environment variable (see src.backends)
+BACKEND = load_backend()
+GPIO = BACKEND.gpio
+board = BACKEND.board
+IBS = BACKEND.ibs
+DEPLOYMENT = BACKEND.deployment  # This variable is to understand whether you are deploying on the actual hardware
 
 
 class CleaningRobot:
@@ -31,6 +40,10 @@ class CleaningRobot:
     PWMB = 32
     STBY = 33
 
+    # Pins written together when starting or stopping a motor
+    WHEEL_MOTOR_PINS = (AIN1, AIN2, PWMA, STBY)
+    ROTATION_MOTOR_PINS = (BIN1, BIN2, PWMB, STBY)
+
     N = 'N'
     S = 'S'
     E = 'E'
@@ -40,6 +53,13 @@ class CleaningRobot:
     RIGHT = 'r'
     FORWARD = 'f'
 
+    # Seconds the motors run for to move the robot by one cell or rotate it by 90 degrees
+    MOTOR_ACTIVATION_TIME = 1.0
+    # Frequency (in Hz) of the PWM signals driving PWMA and PWMB, see enable_speed_control()
+    PWM_FREQUENCY = 1000
+    # Most cells driven with a single activation of the wheel motor, see drive_forward()
+    MAX_DRIVE_CELLS = 16
+
     def __init__(self):
         GPIO.setmode(GPIO.BOARD)
         GPIO.setwarnings(False)
@@ -55,117 +75,448 @@ class CleaningRobot:
         GPIO.setup(self.BIN1, GPIO.OUT)
         GPIO.setup(self.STBY, GPIO.OUT)
 
+        self.gpio = GPIO
+        self.clock = SystemClock()
+        self.instrumentation = None
+        self.journal = None
+        self.optimizer = None
+        # Whether runs of consecutive forward commands are driven as one activation of the wheel motor
+        self.continuous_drive = False
+        # Costs of the commands, used to admit routes before executing them (see route_fits())
+        self.energy_model = None
+
+        # PWM speed control of the motors, see enable_speed_control()
+        self.wheel_pwm = None
+        self.rotation_pwm = None
+        self.wheel_profile = SpeedProfile()
+        self.rotation_profile = SpeedProfile()
+        self.wheel_speed = 0.0
+
+        # Obstacle flag latched by the infrared sensor edges, see enable_obstacle_interrupts()
+        self.obstacle_interrupts = False
+        self.obstacle_latched = False
+        self.obstacle_edge = threading.Event()
+        # Debouncing and caching of the infrared sensor readings; by default, a single read per move
+        self._infrared = InfraredSensor(clock=self.clock)
+
         ic2 = board.I2C()
         self.ibs = IBS.IBS(ic2)
+        self.battery = BatteryMonitor(self.ibs, clock=self.clock)
 
-        self.pos_x = None
-        self.pos_y = None
-        self.heading = None
+        self.state = RobotState()
+        self.grid = OccupancyGrid()
+        # The last steps of the robot, e.g., to retrace them or to diagnose a CleaningRobotError
+        self.trajectory = Trajectory()
 
         self.recharge_led_on = False
         self.cleaning_system_on = False
 
-        self.goingBackToRechargeStation = False
+    def use_clock(self, clock) -> None:
+        """
+        Measure time and wait for the motors with the given clock; with a VirtualClock, the motors take
+        their actual time even when not deploying on the hardware, but it passes instantly
+        """
+        self.clock = clock
+        self.battery.clock = clock
+        self.infrared.clock = clock
+        if self.instrumentation is not None:
+            self.instrumentation.timer = clock.now
+
+    def enable_speed_control(self, wheel_profile: SpeedProfile = None, rotation_profile: SpeedProfile = None) -> None:
+        """
+        Drive PWMA and PWMB with PWM instead of switching them fully on and off, so the motors ramp up and down
+        following their speed profiles and straight runs (see drive_forward()) can go faster
+        """
+        if wheel_profile is not None:
+            self.wheel_profile = wheel_profile
+        if rotation_profile is not None:
+            self.rotation_profile = rotation_profile
+        if self.wheel_pwm is None:
+            self.wheel_pwm = self.gpio.PWM(self.PWMA, self.PWM_FREQUENCY)
+            self.wheel_pwm.start(0)
+            self.rotation_pwm = self.gpio.PWM(self.PWMB, self.PWM_FREQUENCY)
+            self.rotation_pwm.start(0)
+
+    def disable_speed_control(self) -> None:
+        if self.wheel_pwm is None:
+            return
+        self.wheel_pwm.stop()
+        self.rotation_pwm.stop()
+        self.wheel_pwm = None
+        self.rotation_pwm = None
+
+    def enable_instrumentation(self, instrumentation: Instrumentation = None) -> Instrumentation:
+        """
+        Start recording the latency of every command, the GPIO and IBS calls, and the time spent going back
+        to the recharge station. Until this is called, the robot runs without any instrumentation overhead
+        :param instrumentation: where to record the measures (by default, a new Instrumentation)
+        """
+        if self.instrumentation is not None:
+            self.disable_instrumentation()
+        if instrumentation is None:
+            instrumentation = Instrumentation(timer=self.clock.now)
+        self.instrumentation = instrumentation
+        self.gpio = InstrumentedGPIO(GPIO, instrumentation)
+        self.battery.ibs = InstrumentedIBS(self.ibs, instrumentation)
+        self.perform_command = instrumentation.time_command(self.perform_command)
+        self.drive_cell = instrumentation.time_command(self.drive_cell)
+        self.go_to_recharge_station = instrumentation.time_recharge_trip(self.go_to_recharge_station)
+        return instrumentation
+
+    def disable_instrumentation(self) -> None:
+        if self.instrumentation is None:
+            return
+        self.instrumentation = None
+        self.gpio = GPIO
+        self.battery.ibs = self.ibs
+        del self.perform_command
+        del self.drive_cell
+        del self.go_to_recharge_station
+
+    @property
+    def pos_x(self) -> int:
+        return self.state.x
+
+    @pos_x.setter
+    def pos_x(self, value: int) -> None:
+        self.state.x = value
+
+    @property
+    def pos_y(self) -> int:
+        return self.state.y
+
+    @pos_y.setter
+    def pos_y(self, value: int) -> None:
+        self.state.y = value
+
+    @property
+    def heading(self) -> str:
+        return HEADINGS[self.state.heading] if self.state.heading is not None else None
+
+    @heading.setter
+    def heading(self, value: str) -> None:
+        self.state.heading = HEADING_CODES[value] if value is not None else None
+
+    @property
+    def goingBackToRechargeStation(self) -> bool:
+        return self.state.going_back
+
+    @goingBackToRechargeStation.setter
+    def goingBackToRechargeStation(self, value: bool) -> None:
+        self.state.going_back = value
+
+    @property
+    def infrared(self) -> InfraredSensor:
+        return self._infrared
+
+    @infrared.setter
+    def infrared(self, sensor: InfraredSensor) -> None:
+        # The age of the cached readings is measured with the clock of the robot, see use_clock()
+        sensor.clock = self.clock
+        self._infrared = sensor
 
     def initialize_robot(self) -> None:
         self.pos_x = 0
         self.pos_y = 0
         self.heading = self.N
+        self.grid.mark_free(0, 0, cleaned=self.cleaning_system_on)
+        self.trajectory.reset(0, 0, self.state.heading)
 
     def robot_status(self) -> str:
-        return f"({self.pos_x},{self.pos_y},{self.heading})"
+        state = self.state
+        return f"({state.x},{state.y},{HEADINGS[state.heading] if state.heading is not None else None})"
+
+    def result(self, obstacle: tuple = None, low_battery: bool = False) -> CommandResult:
+        """
+        Returns the current position and heading of the robot as a CommandResult
+        """
+        state = self.state
+        return CommandResult(state.x, state.y, HEADINGS[state.heading] if state.heading is not None else None,
+                             obstacle, low_battery)
 
     def execute_command(self, command: str) -> str:
-        if self.ibs.get_charge_left() <= 10:
-            self.manage_cleaning_system()
-            return '!'+self.robot_status()
-        if self.ibs.get_charge_left() <= 24 and not self.goingBackToRechargeStation:
+        return str(self.execute(command))
+
+    def execute(self, command: str) -> CommandResult:
+        """
+        Same as execute_command, but returns the outcome of the command as a CommandResult
+        """
+        charge_left = self.battery.get_charge_left()
+        if charge_left <= 10:
+            return self.refuse_command(command)
+        if charge_left <= 24 and not self.goingBackToRechargeStation:
             self.goingBackToRechargeStation = True
             self.go_to_recharge_station()
+            return self.result()
+        return self.perform_command(command)
+
+    def execute_commands(self, commands: Iterable[str], battery_check_window: int = 1) -> Iterator[str]:
+        """
+        Lazily execute a stream of commands, yielding the robot status after each step.
+        The battery is read once every battery_check_window commands; the stream stops as soon as
+        the battery is too low to go on (the last status is then prefixed with "!") or the robot
+        has been sent back to the recharge station
+        :param commands: a command string (e.g., "ffrffl") or any iterable of single commands
+        :param battery_check_window: number of commands executed between two battery reads
+        If an optimizer is set (see CommandOptimizer), the commands are optimized first and a status is
+        yielded for each optimized command instead
+        """
+        return map(str, self.execute_stream(commands, battery_check_window))
+
+    def execute_stream(self, commands: Iterable[str], battery_check_window: int = 1) -> Iterator[CommandResult]:
+        """
+        Same as execute_commands, but yields the outcome of each step as a CommandResult
+        """
+        if battery_check_window < 1:
+            raise CleaningRobotError()
+        if self.optimizer is not None:
+            commands = self.optimizer.stream(commands)
+        i = 0
+        for command, group in groupby(commands):
+            driving = command == self.FORWARD and self.continuous_drive
+            # A run of forward commands is driven MAX_DRIVE_CELLS at a time, so long (or endless) runs are not
+            # read ahead in full before the robot moves
+            runs = iter(lambda: list(islice(group, self.MAX_DRIVE_CELLS)), []) if driving else (group,)
+            for run in runs:
+                drive = self.drive_forward(len(run)) if driving else None
+                try:
+                    for command in run:
+                        if i % battery_check_window == 0:
+                            charge_left = self.battery.get_charge_left()
+                            if charge_left <= 10:
+                                if drive is not None:
+                                    drive.close()
+                                yield self.refuse_command(command)
+                                return
+                            if charge_left <= 24 and not self.goingBackToRechargeStation:
+                                if drive is not None:
+                                    drive.close()
+                                self.goingBackToRechargeStation = True
+                                self.go_to_recharge_station()
+                                yield self.result()
+                                return
+                        i += 1
+                        # Once the drive stops at an obstacle, the rest of the run is executed command by command
+                        result = next(drive, None) if drive is not None else None
+                        yield result if result is not None else self.perform_command(command)
+                finally:
+                    if drive is not None:
+                        drive.close()
+
+    def refuse_command(self, command: str) -> CommandResult:
+        """
+        Turn off the cleaning system and turn on the recharge LED instead of executing a command
+        """
+        self.manage_cleaning_system()
+        result = self.result(low_battery=True)
+        if self.journal is not None:
+            self.record_command(command, result)
+        return result
+
+    def perform_command(self, command: str) -> CommandResult:
+        """
+        Move or rotate the robot without checking the battery
+        :param command: "f" to move forward, "l" to turn left, "r" to turn right
+        """
+        if command == self.FORWARD:
+            self.activate_wheel_motor()
+            result = self.move_forward()
         else:
-            newPosX = self.pos_x
-            newPosY = self.pos_y
-            if command == self.FORWARD:
-                self.activate_wheel_motor()
-                if self.heading == self.N:
-                    newPosY = self.pos_y + 1
-                if self.heading == self.E:
-                    newPosX = self.pos_x + 1
-                if self.heading == self.W:
-                    newPosX = self.pos_x - 1
-                if self.heading == self.S:
-                    newPosY = self.pos_y - 1
-                if not self.obstacle_found():
-                    self.pos_x = newPosX
-                    self.pos_y = newPosY
-                else:
-                    return self.robot_status() + f',({newPosX},{newPosY})'
-            else:
-                if command == self.LEFT:
-                    if self.heading == self.N:
-                        self.heading = self.W
-                    elif self.heading == self.W:
-                        self.heading = self.S
-                    elif self.heading == self.S:
-                        self.heading = self.E
-                    elif self.heading == self.E:
-                        self.heading = self.N
-                else:
-                    if self.heading == self.N:
-                        self.heading = self.E
-                    elif self.heading == self.E:
-                        self.heading = self.S
-                    elif self.heading == self.S:
-                        self.heading = self.W
-                    elif self.heading == self.W:
-                        self.heading = self.N
-                    self.activate_rotation_motor(command)
-            return self.robot_status()
-
-    def obstacle_found(self) -> bool:
-        return GPIO.input(self.INFRARED_PIN)
+            self.rotate(command)
+            self.activate_rotation_motor(command)
+            result = self.result()
+        if self.journal is not None:
+            self.record_command(command, result)
+        return result
+
+    def drive_forward(self, cells: int) -> Iterator[CommandResult]:
+        """
+        Move forward by up to the given number of cells with a single activation of the wheel motor, yielding
+        the outcome of each cell. The infrared sensor is checked after every cell: the motor stops at the first
+        obstacle, leaving the robot in front of it. The motor keeps running between the cells (it is stopped
+        before the last one is yielded), so consumers of the outcomes must not block; closing the generator
+        stops the motor
+        """
+        self.start_wheel_motor()
+        running = True
+        try:
+            for cell in range(cells, 0, -1):
+                if self.wheel_pwm is not None:
+                    self.set_wheel_speed(self.wheel_profile.speed(cell))
+                result = self.drive_cell(self.FORWARD)
+                if result.obstacle is not None or cell == 1:
+                    self.stop_wheel_motor()
+                    running = False
+                yield result
+                if not running:
+                    return
+        finally:
+            if running:
+                self.stop_wheel_motor()
+
+    def drive_cell(self, command: str) -> CommandResult:
+        """
+        Move the robot forward by one cell of a continuous drive, with the wheel motor already running;
+        the counterpart of perform_command for drive_forward(), so it is instrumented the same way
+        :param command: "f"
+        """
+        self.wait_for_wheel_motor()
+        result = self.move_forward()
+        if self.journal is not None:
+            self.record_command(command, result)
+        return result
+
+    def record_command(self, command: str, result: CommandResult) -> None:
+        """
+        Append the outcome of a command to the journal
+        """
+        self.journal.append(command, result.x, result.y, self.state.heading, result.obstacle, result.low_battery,
+                            self.battery.last_reading)
+
+    def move_forward(self) -> CommandResult:
+        """
+        Update the position of the robot once the wheel motor moved it forward, unless an obstacle is found
+        """
+        state = self.state
+        newPosX = state.x + DX[state.heading]
+        newPosY = state.y + DY[state.heading]
+        # An obstacle may have shown up while the robot was moving: a cached clear reading would hide it
+        if not self.obstacle_found(fresh=True):
+            state.x = newPosX
+            state.y = newPosY
+            self.grid.mark_free(newPosX, newPosY, cleaned=self.cleaning_system_on)
+            self.trajectory.record(MOVED)
+            return self.result()
+        self.grid.mark_obstacle(newPosX, newPosY)
+        self.trajectory.record(BLOCKED)
+        return self.result(obstacle=(newPosX, newPosY))
+
+    def rotate(self, direction: str) -> None:
+        """
+        Update the heading of the robot
+        :param direction: "l" to turn left, "r" to turn right
+        """
+        state = self.state
+        if direction == self.LEFT:
+            state.heading = TURN_LEFT[state.heading]
+            self.trajectory.record(LEFT)
+        else:
+            state.heading = TURN_RIGHT[state.heading]
+            self.trajectory.record(RIGHT)
+
+    def obstacle_found(self, fresh: bool = False) -> bool:
+        """
+        :param fresh: read the infrared sensor even if the cell ahead was recently found clear
+        """
+        if self.obstacle_interrupts:
+            return self.obstacle_latched
+        return self.infrared.obstacle_found(self.read_infrared, self.cell_ahead(), fresh)
+
+    def cell_ahead(self) -> Tuple[int, int]:
+        state = self.state
+        return state.x + DX[state.heading], state.y + DY[state.heading]
+
+    def read_infrared(self) -> int:
+        return self.gpio.input(self.INFRARED_PIN)
+
+    def enable_obstacle_interrupts(self) -> None:
+        """
+        Track the infrared sensor through edge events instead of reading it after every move: obstacle_found()
+        then returns a flag latched by the events, and the wheel motor stops as soon as an obstacle shows up
+        """
+        if self.obstacle_interrupts:
+            return
+        self.on_infrared_edge(self.INFRARED_PIN)
+        self.gpio.add_event_detect(self.INFRARED_PIN, GPIO.BOTH, callback=self.on_infrared_edge)
+        self.obstacle_interrupts = True
+
+    def disable_obstacle_interrupts(self) -> None:
+        if not self.obstacle_interrupts:
+            return
+        self.gpio.remove_event_detect(self.INFRARED_PIN)
+        self.obstacle_interrupts = False
+
+    def on_infrared_edge(self, channel) -> None:
+        self.obstacle_latched = bool(self.gpio.input(channel))
+        if self.obstacle_latched:
+            self.obstacle_edge.set()
+        else:
+            self.obstacle_edge.clear()
 
     def go_to_recharge_station(self):
-        if self.pos_x > 0:
-            while self.heading != self.W:
-                self.execute_command(self.LEFT)
-            while self.pos_x != 0:
-                status = self.execute_command(self.FORWARD)
-                if status == self.robot_status() + f',({self.pos_x - 1},{self.pos_y})':
-                    raise CleaningRobotError()
-        elif self.pos_x < 0:
-            while self.heading != self.E:
-                self.execute_command(self.RIGHT)
-            while self.pos_x != 0:
-                status = self.execute_command(self.FORWARD)
-                if status == self.robot_status() + f',({self.pos_x + 1},{self.pos_y})':
-                    raise CleaningRobotError()
-        if self.pos_y > 0:
-            while self.heading != self.S:
-                self.execute_command(self.LEFT)
-            while self.pos_y != 0:
-                status = self.execute_command(self.FORWARD)
-                if status == self.robot_status() + f',({self.pos_x},{self.pos_y - 1})':
-                    raise CleaningRobotError()
-        elif self.pos_y < 0:
-            while self.heading != self.N:
-                self.execute_command(self.RIGHT)
-            while self.pos_y != 0:
-                status = self.execute_command(self.FORWARD)
-                if status == self.robot_status() + f',({self.pos_x},{self.pos_y + 1})':
-                    raise CleaningRobotError()
-        while self.heading != self.E:
-            self.execute_command(self.LEFT)
+        """
+        Drive the robot back to the recharge station in (0,0) along the shortest route avoiding the known
+        obstacles, replanning whenever a new obstacle shows up. The robot ends up heading E
+        """
+        self.goingBackToRechargeStation = True
+        while (self.pos_x, self.pos_y, self.heading) != (0, 0, self.E):
+            for command in self.plan_route_to_recharge_station():
+                result = self.execute(command)
+                if result.low_battery:
+                    raise CleaningRobotError("battery too low to reach the recharge station")
+                if result.obstacle is not None:
+                    break
+
+    def plan_route_to_recharge_station(self) -> str:
+        route = plan_route((self.pos_x, self.pos_y, self.heading), (0, 0), self.is_known_obstacle,
+                           self.known_area(), goal_heading=self.E)
+        if route is None:
+            raise CleaningRobotError("no route to the recharge station")
+        return route
+
+    def route_energy(self, commands: str) -> float:
+        """
+        Estimates the charge needed to execute a route and then go back to the recharge station, according to
+        the energy model; the route stops in front of the known obstacles. Returns inf if there is no way back
+        """
+        if self.energy_model is None:
+            raise CleaningRobotError()
+        x, y, heading = self.pos_x, self.pos_y, self.heading
+        for command in commands:
+            next_x, next_y, next_heading = apply_command((x, y, heading), command)
+            if not self.is_known_obstacle(next_x, next_y):
+                x, y, heading = next_x, next_y, next_heading
+        min_x, min_y, max_x, max_y = self.known_area()
+        return_trip = plan_route((x, y, heading), (0, 0), self.is_known_obstacle,
+                                 (min(min_x, x - 1), min(min_y, y - 1), max(max_x, x + 1), max(max_y, y + 1)),
+                                 goal_heading=self.E)
+        if return_trip is None:
+            return float('inf')
+        return self.energy_model.cost(commands, self.cleaning_system_on) + \
+            self.energy_model.cost(return_trip, self.cleaning_system_on)
+
+    def route_fits(self, commands: str) -> bool:
+        """
+        Tells whether a route can be executed without the battery dropping to the recharge threshold, and the
+        robot can then go back to the recharge station without the battery dropping to the low battery threshold
+        """
+        charge_left = self.battery.get_charge_left()
+        energy = self.route_energy(commands)
+        route_energy = self.energy_model.cost(commands, self.cleaning_system_on)
+        return charge_left - route_energy > self.battery.RECHARGE_THRESHOLD and \
+            charge_left - energy > self.battery.LOW_BATTERY_THRESHOLD
+
+    def is_known_obstacle(self, x: int, y: int) -> bool:
+        return self.grid.is_obstacle(x, y)
+
+    def known_area(self) -> tuple:
+        """
+        Returns the (min_x, min_y, max_x, max_y) bounds of the area mapped so far, including the robot
+        and the recharge station, plus a one-cell border to drive around the known obstacles
+        """
+        min_x, min_y, max_x, max_y = self.grid.marked_area() or (0, 0, 0, 0)
+        return (min(min_x, 0, self.pos_x) - 1, min(min_y, 0, self.pos_y) - 1,
+                max(max_x, 0, self.pos_x) + 1, max(max_y, 0, self.pos_y) + 1)
 
     def manage_cleaning_system(self) -> None:
-        if self.ibs.get_charge_left() <= 10:
-            GPIO.output(self.CLEANING_SYSTEM_PIN, GPIO.LOW)
-            GPIO.output(self.RECHARGE_LED_PIN, GPIO.HIGH)
+        if self.battery.get_charge_left() <= 10:
+            self.gpio.output(self.CLEANING_SYSTEM_PIN, GPIO.LOW)
+            self.gpio.output(self.RECHARGE_LED_PIN, GPIO.HIGH)
             self.cleaning_system_on = False
             self.recharge_led_on = True
         else:
-            GPIO.output(self.CLEANING_SYSTEM_PIN, GPIO.HIGH)
-            GPIO.output(self.RECHARGE_LED_PIN, GPIO.LOW)
+            self.gpio.output(self.CLEANING_SYSTEM_PIN, GPIO.HIGH)
+            self.gpio.output(self.RECHARGE_LED_PIN, GPIO.LOW)
             self.cleaning_system_on = True
             self.recharge_led_on = False
 
@@ -173,46 +524,114 @@ class CleaningRobot:
         """
         Let the robot move forward by activating its wheel motor
         """
-        # Drive the motor clockwise
-        GPIO.output(self.AIN1, GPIO.HIGH)
-        GPIO.output(self.AIN2, GPIO.LOW)
-        # Set the motor speed
-        GPIO.output(self.PWMA, GPIO.HIGH)
-        # Disable STBY
-        GPIO.output(self.STBY, GPIO.HIGH)
+        self.start_wheel_motor()
+        self.wait_for_wheel_motor()
+        self.stop_wheel_motor()
+
+    def wait_for_wheel_motor(self) -> None:
+        """
+        Wait for the wheel motor to move the robot by one cell
+        """
+        cell_time = self.wheel_cell_time()
+        if DEPLOYMENT or self.clock.virtual: # Sleep only on the actual hardware or in simulated time
+            if self.obstacle_interrupts:
+                # Wait for the motor to actually move, unless an obstacle shows up
+                self.clock.wait(self.obstacle_edge, cell_time)
+            else:
+                self.clock.sleep(cell_time) # Wait for the motor to actually move
+
+    def wheel_cell_time(self) -> float:
+        """
+        Returns how long the wheel motor takes to move the robot by one cell at its current speed
+        """
+        if self.wheel_pwm is None:
+            return self.MOTOR_ACTIVATION_TIME
+        return self.wheel_profile.cell_time(self.wheel_speed, self.MOTOR_ACTIVATION_TIME)
+
+    def start_wheel_motor(self) -> None:
+        if self.wheel_pwm is None:
+            # Drive the motor clockwise (AIN1 high, AIN2 low), set its speed (PWMA) and disable STBY at once
+            self.gpio.output(self.WHEEL_MOTOR_PINS, (GPIO.HIGH, GPIO.LOW, GPIO.HIGH, GPIO.HIGH))
+            return
+        self.engage_wheel_motor()
+        self.ramp(self.wheel_pwm, self.wheel_profile.ramp_up, self.wheel_profile.step_time)
+        self.set_wheel_speed(self.wheel_profile.cruise)
 
-        if DEPLOYMENT: # Sleep only if you are deploying on the actual hardware
-            time.sleep(1) # Wait for the motor to actually move
+    def stop_wheel_motor(self) -> None:
+        if self.wheel_pwm is None:
+            self.gpio.output(self.WHEEL_MOTOR_PINS, GPIO.LOW)
+            return
+        self.ramp(self.wheel_pwm, self.wheel_profile.ramp_down, self.wheel_profile.step_time)
+        self.set_wheel_speed(0)
+        self.release_wheel_motor()
 
-        # Stop the motor
-        GPIO.output(self.AIN1, GPIO.LOW)
-        GPIO.output(self.AIN2, GPIO.LOW)
-        GPIO.output(self.PWMA, GPIO.LOW)
-        GPIO.output(self.STBY, GPIO.LOW)
+    def engage_wheel_motor(self) -> None:
+        # With speed control, PWMA is driven by the PWM signal: only the direction pins and STBY are written
+        self.gpio.output((self.AIN1, self.AIN2, self.STBY), (GPIO.HIGH, GPIO.LOW, GPIO.HIGH))
+
+    def release_wheel_motor(self) -> None:
+        self.gpio.output((self.AIN1, self.AIN2, self.STBY), GPIO.LOW)
+
+    def set_wheel_speed(self, duty_cycle: float) -> None:
+        if duty_cycle != self.wheel_speed:
+            self.wheel_pwm.ChangeDutyCycle(duty_cycle)
+            self.wheel_speed = duty_cycle
+
+    def ramp(self, pwm, duty_cycles, step_time: float) -> None:
+        """
+        Change the duty cycle of a PWM signal step by step, holding each step for step_time seconds
+        """
+        for duty_cycle in duty_cycles:
+            pwm.ChangeDutyCycle(duty_cycle)
+            if DEPLOYMENT or self.clock.virtual:  # Sleep only on the actual hardware or in simulated time
+                self.clock.sleep(step_time)
 
     def activate_rotation_motor(self, direction) -> None:
         """
         Let the robot rotate towards a given direction
         :param direction: "l" to turn left, "r" to turn right
         """
+        self.start_rotation_motor(direction)
+
+        if DEPLOYMENT or self.clock.virtual:  # Sleep only on the actual hardware or in simulated time
+            self.clock.sleep(self.MOTOR_ACTIVATION_TIME)  # Wait for the motor to actually move
+
+        self.stop_rotation_motor()
+
+    def start_rotation_motor(self, direction) -> None:
+        if self.rotation_pwm is not None:
+            self.start_rotation_motor_pwm(direction)
+            return
         if direction == self.LEFT:
-            GPIO.output(self.BIN1, GPIO.HIGH)
-            GPIO.output(self.BIN2, GPIO.LOW)
+            self.gpio.output(self.ROTATION_MOTOR_PINS, (GPIO.HIGH, GPIO.LOW, GPIO.HIGH, GPIO.HIGH))
         elif direction == self.RIGHT:
-            GPIO.output(self.BIN1, GPIO.LOW)
-            GPIO.output(self.BIN2, GPIO.HIGH)
+            self.gpio.output(self.ROTATION_MOTOR_PINS, (GPIO.LOW, GPIO.HIGH, GPIO.HIGH, GPIO.HIGH))
+        else:
+            self.gpio.output((self.PWMB, self.STBY), GPIO.HIGH)
+
+    def start_rotation_motor_pwm(self, direction) -> None:
+        self.engage_rotation_motor(direction)
+        self.ramp(self.rotation_pwm, self.rotation_profile.ramp_up, self.rotation_profile.step_time)
+        self.rotation_pwm.ChangeDutyCycle(self.rotation_profile.cruise)
 
-        GPIO.output(self.PWMB, GPIO.HIGH)
-        GPIO.output(self.STBY, GPIO.HIGH)
+    def engage_rotation_motor(self, direction) -> None:
+        if direction == self.LEFT:
+            self.gpio.output((self.BIN1, self.BIN2, self.STBY), (GPIO.HIGH, GPIO.LOW, GPIO.HIGH))
+        elif direction == self.RIGHT:
+            self.gpio.output((self.BIN1, self.BIN2, self.STBY), (GPIO.LOW, GPIO.HIGH, GPIO.HIGH))
+        else:
+            self.gpio.output(self.STBY, GPIO.HIGH)
 
-        if DEPLOYMENT:  # Sleep only if you are deploying on the actual hardware
-            time.sleep(1)  # Wait for the motor to actually move
+    def stop_rotation_motor(self) -> None:
+        if self.rotation_pwm is None:
+            self.gpio.output(self.ROTATION_MOTOR_PINS, GPIO.LOW)
+            return
+        self.ramp(self.rotation_pwm, self.rotation_profile.ramp_down, self.rotation_profile.step_time)
+        self.rotation_pwm.ChangeDutyCycle(0)
+        self.release_rotation_motor()
 
-        # Stop the motor
-        GPIO.output(self.BIN1, GPIO.LOW)
-        GPIO.output(self.BIN2, GPIO.LOW)
-        GPIO.output(self.PWMB, GPIO.LOW)
-        GPIO.output(self.STBY, GPIO.LOW)
+    def release_rotation_motor(self) -> None:
+        self.gpio.output((self.BIN1, self.BIN2, self.STBY), GPIO.LOW)
 
 
 class CleaningRobotError(Exception):
@@ -0,0 +1,87 @@
+import heapq
+import threading
+import time
+from itertools import count
+from typing import Callable
+
+
+class SystemClock:
+    """
+    Real time: sleeping blocks the calling thread
+    """
+
+    virtual = False
+
+    def now(self) -> float:
+        return time.perf_counter()
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+    def wait(self, event: threading.Event, timeout: float) -> bool:
+        """
+        Waits until the event is set or the timeout expires; returns whether the event is set
+        """
+        return event.wait(timeout)
+
+
+class VirtualClock:
+    """
+    Simulated time: sleeping advances the clock instantly, firing the scheduled callbacks in order on the way,
+    so hours of hardware-faithful activity can be replayed in seconds
+    """
+
+    virtual = True
+
+    def __init__(self, start: float = 0.0):
+        self.time = start
+        self._timers = []
+        self._sequence = count()
+
+    def now(self) -> float:
+        return self.time
+
+    def call_at(self, when: float, callback: Callable[[], None]) -> None:
+        """
+        Schedules a callback (e.g., a simulated sensor edge) to be called when the clock reaches the given time
+        """
+        heapq.heappush(self._timers, (when, next(self._sequence), callback))
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> None:
+        self.call_at(self.time + delay, callback)
+
+    def advance(self, seconds: float) -> None:
+        self.advance_to(self.time + seconds)
+
+    def advance_to(self, when: float) -> None:
+        while self._timers and self._timers[0][0] <= when:
+            timer_time, _, callback = heapq.heappop(self._timers)
+            self.time = max(self.time, timer_time)
+            callback()
+        self.time = max(self.time, when)
+
+    def sleep(self, seconds: float) -> None:
+        self.advance(seconds)
+
+    def wait(self, event: threading.Event, timeout: float) -> bool:
+        deadline = self.time + timeout
+        while not event.is_set() and self._timers and self._timers[0][0] <= deadline:
+            self.advance_to(self._timers[0][0])
+        if not event.is_set():
+            self.time = max(self.time, deadline)
+        return event.is_set()
+
+
+class DrainingIBS:
+    """
+    Simulated IBS whose charge drops linearly with the time of a clock
+    """
+
+    def __init__(self, clock, charge: float = 100.0, drain_per_second: float = 0.0):
+        self.clock = clock
+        self.charge = charge
+        self.drain_per_second = drain_per_second
+        self.start = clock.now()
+
+    def get_charge_left(self) -> int:
+        return max(0, int(self.charge - self.drain_per_second * (self.clock.now() - self.start)))
@@ -0,0 +1,138 @@
+import mmap
+import os
+import struct
+import sys
+from typing import Iterator, NamedTuple, Optional, Tuple
+
+from src.occupancy_grid import OccupancyGrid
+from src.robot_state import HEADINGS
+
+# command, flags, heading code (-1 if unknown), battery (-1 if unknown), x, y, obstacle x, obstacle y
+RECORD = struct.Struct('<cBbbiiii')
+
+OBSTACLE_FLAG = 1
+LOW_BATTERY_FLAG = 2
+
+
+class JournalRecord(NamedTuple):
+    command: str
+    x: int
+    y: int
+    heading: Optional[str]
+    obstacle: Optional[Tuple[int, int]]
+    low_battery: bool
+    battery: Optional[int]
+
+
+class CommandJournal:
+    """
+    Append-only journal of the executed commands, stored as fixed-width binary records (RECORD.size bytes each)
+    holding the command, the resulting position and heading, the obstacle found (if any) and the battery reading
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, 'ab')
+
+    def append(self, command: str, x: int, y: int, heading: Optional[int], obstacle: Optional[Tuple[int, int]],
+               low_battery: bool, battery: Optional[float]) -> None:
+        """
+        :param command: the command, a single ASCII character
+        :param heading: the heading, encoded as an index in HEADINGS
+        :param battery: the charge left (in percent), stored rounded to an integer between 0 and 100
+        """
+        if len(command) != 1 or not command.isascii():
+            raise ValueError(f"Cannot journal command {command!r}: commands are single ASCII characters")
+        flags = LOW_BATTERY_FLAG if low_battery else 0
+        obstacle_x = obstacle_y = 0
+        if obstacle is not None:
+            flags |= OBSTACLE_FLAG
+            obstacle_x, obstacle_y = obstacle
+        self.file.write(RECORD.pack(command.encode(), flags, -1 if heading is None else heading,
+                                    -1 if battery is None else min(max(round(battery), 0), 100),
+                                    x, y, obstacle_x, obstacle_y))
+
+    def flush(self) -> None:
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+    def __enter__(self) -> "CommandJournal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class JournalReader:
+    """
+    Memory-mapped, read-only view of a journal written by CommandJournal
+    """
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            # A record being written when the robot stopped may be truncated: it is ignored
+            self.size = os.fstat(f.fileno()).st_size // RECORD.size
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b''
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: int) -> JournalRecord:
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+        return self._record(RECORD.unpack_from(self.data, index * RECORD.size))
+
+    def __iter__(self) -> Iterator[JournalRecord]:
+        return map(self._record, self.raw_records())
+
+    def raw_records(self, stop: Optional[int] = None) -> Iterator[tuple]:
+        """
+        Iterates over the undecoded records (as returned by RECORD.unpack), up to the stop-th record excluded
+        """
+        stop = self.size if stop is None else min(stop, self.size)
+        return RECORD.iter_unpack(memoryview(self.data)[:stop * RECORD.size])
+
+    def state_at(self, index: int) -> Tuple[int, int, Optional[str]]:
+        """
+        Returns the position and heading of the robot after the index-th command
+        """
+        record = self[index]
+        return record.x, record.y, record.heading
+
+    def grid_at(self, index: int) -> OccupancyGrid:
+        """
+        Rebuilds the map of the room as it was known after the index-th command
+        """
+        grid = OccupancyGrid()
+        for _, flags, _, _, x, y, obstacle_x, obstacle_y in self.raw_records(index + 1):
+            if flags & OBSTACLE_FLAG:
+                grid.mark_obstacle(obstacle_x, obstacle_y)
+            else:
+                grid.mark_free(x, y)
+        return grid
+
+    def close(self) -> None:
+        if self.size:
+            self.data.close()
+
+    @staticmethod
+    def _record(raw: tuple) -> JournalRecord:
+        command, flags, heading, battery, x, y, obstacle_x, obstacle_y = raw
+        return JournalRecord(command.decode(), x, y, HEADINGS[heading] if heading >= 0 else None,
+                             (obstacle_x, obstacle_y) if flags & OBSTACLE_FLAG else None,
+                             bool(flags & LOW_BATTERY_FLAG), battery if battery >= 0 else None)
+
+
+if __name__ == '__main__':
+    # Usage: python -m src.command_journal <journal> [<index>]
+    reader = JournalReader(sys.argv[1])
+    if len(sys.argv) > 2:
+        print(reader[int(sys.argv[2])])
+    else:
+        for record in reader:
+            print(record)
+    reader.close()
@@ -0,0 +1,62 @@
+from typing import Iterable, Iterator
+
+LEFT = 'l'
+RIGHT = 'r'
+
+
+def net_rotation(rotations: str) -> str:
+    """
+    Returns the shortest sequence of rotations leaving the robot with the same heading as the given ones:
+    rotations cancel out in pairs ("lr"), four of them in the same direction are a full turn, and three
+    of them in one direction are one in the other. A half turn keeps the direction of the first rotation
+    """
+    turns = (rotations.count(RIGHT) - rotations.count(LEFT)) % 4
+    if turns == 1:
+        return RIGHT
+    if turns == 3:
+        return LEFT
+    if turns == 2:
+        return rotations[0] * 2
+    return ''
+
+
+class CommandOptimizer:
+    """
+    Peephole optimizer rewriting command streams into equivalent ones with fewer motor activations,
+    by collapsing every run of consecutive rotations into its net rotation. Moving forward (whether an
+    obstacle stops the robot or not) never depends on how the robot got to its heading, so the position,
+    heading and obstacles found along the optimized stream are the same as along the original one
+    """
+
+    def __init__(self):
+        self.commands_in = 0
+        self.commands_out = 0
+        self.rotations_saved = 0
+
+    def optimize(self, commands: str) -> str:
+        return ''.join(self.stream(commands))
+
+    def stream(self, commands: Iterable[str]) -> Iterator[str]:
+        """
+        Lazily optimizes a stream of commands: rotations are held back until the next command
+        that is not a rotation (or the end of the stream)
+        """
+        rotations = []
+        for command in commands:
+            self.commands_in += 1
+            if command == LEFT or command == RIGHT:
+                rotations.append(command)
+                continue
+            if rotations:
+                yield from self._flush(rotations)
+            self.commands_out += 1
+            yield command
+        if rotations:
+            yield from self._flush(rotations)
+
+    def _flush(self, rotations: list) -> str:
+        optimized = net_rotation(''.join(rotations))
+        self.rotations_saved += len(rotations) - len(optimized)
+        self.commands_out += len(optimized)
+        rotations.clear()
+        return optimized
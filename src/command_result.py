@@ -0,0 +1,36 @@
+from typing import Optional, Tuple
+
+
+class CommandResult:
+    """
+    Outcome of a command: the position and heading of the robot afterwards, the obstacle that stopped it
+    (if any) and whether the command was refused because of low battery. str() gives the status line
+    returned by CleaningRobot.execute_command, e.g. "(1,2,N)", "(1,2,N),(1,3)" or "!(1,2,N)"
+    """
+
+    __slots__ = ('x', 'y', 'heading', 'obstacle', 'low_battery')
+
+    def __init__(self, x: int, y: int, heading: str, obstacle: Optional[Tuple[int, int]] = None,
+                 low_battery: bool = False):
+        self.x = x
+        self.y = y
+        self.heading = heading
+        self.obstacle = obstacle
+        self.low_battery = low_battery
+
+    def __str__(self) -> str:
+        status = f"({self.x},{self.y},{self.heading})"
+        if self.obstacle is not None:
+            status += f",({self.obstacle[0]},{self.obstacle[1]})"
+        if self.low_battery:
+            status = '!' + status
+        return status
+
+    def __repr__(self) -> str:
+        return f"CommandResult({self})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CommandResult):
+            return NotImplemented
+        return (self.x, self.y, self.heading, self.obstacle, self.low_battery) == \
+            (other.x, other.y, other.heading, other.obstacle, other.low_battery)
@@ -0,0 +1,81 @@
+from collections import deque
+from typing import Callable, Iterator, Optional, Set, Tuple
+
+from src.occupancy_grid import OccupancyGrid
+from src.route_planner import apply_command, plan_route
+
+ROWS = 'rows'
+COLUMNS = 'columns'
+
+
+def plan_coverage(width: int, height: int, grid: Optional[OccupancyGrid] = None,
+                  start: Tuple[int, int, str] = (0, 0, 'N'), sweep: Optional[str] = None) -> str:
+    """
+    Compiles a boustrophedon (back and forth) route covering every reachable free cell of the room into a
+    command string. Consecutive cells of the sweep are joined with plan_route, so obstacles are driven around
+    :param width: the number of cells of the room along x
+    :param height: the number of cells of the room along y
+    :param grid: the known map of the room, if any
+    :param start: the starting position and heading of the robot
+    :param sweep: ROWS to sweep along x, COLUMNS to sweep along y; by default the one with fewer rotations is used
+    :return: the route as a command string (e.g., "ffrfrff")
+    """
+    is_blocked = grid.is_obstacle if grid is not None else lambda x, y: False
+    bounds = (0, 0, width - 1, height - 1)
+    # Cells cut off by obstacles are skipped up front: searching a route to them would explore the whole room
+    reachable = reachable_cells(start[:2], is_blocked, bounds)
+    if sweep is None:
+        routes = [_plan_sweep(width, height, is_blocked, bounds, reachable, start, sweep) for sweep in (COLUMNS, ROWS)]
+        return min(routes, key=rotations)
+    return _plan_sweep(width, height, is_blocked, bounds, reachable, start, sweep)
+
+
+def reachable_cells(start: Tuple[int, int], is_blocked: Callable[[int, int], bool],
+                    bounds: Tuple[int, int, int, int]) -> Set[Tuple[int, int]]:
+    """
+    Returns the cells within bounds that can be reached from start without going through an obstacle
+    """
+    min_x, min_y, max_x, max_y = bounds
+    reachable = {start}
+    frontier = deque([start])
+    while frontier:
+        x, y = frontier.popleft()
+        for cell in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if cell not in reachable and min_x <= cell[0] <= max_x and min_y <= cell[1] <= max_y \
+                    and not is_blocked(*cell):
+                reachable.add(cell)
+                frontier.append(cell)
+    return reachable
+
+
+def rotations(commands: str) -> int:
+    return len(commands) - commands.count('f')
+
+
+def _plan_sweep(width: int, height: int, is_blocked: Callable[[int, int], bool], bounds: Tuple[int, int, int, int],
+                reachable: Set[Tuple[int, int]], start: Tuple[int, int, str], sweep: str) -> str:
+    state = start
+    covered = {start[:2]}
+    commands = []
+    for cell in _sweep(width, height, sweep):
+        if cell in covered or cell not in reachable:
+            continue
+        route = plan_route(state, cell, is_blocked, bounds)
+        if route is None:
+            continue
+        for command in route:
+            state = apply_command(state, command)
+            covered.add(state[:2])
+        commands.append(route)
+    return ''.join(commands)
+
+
+def _sweep(width: int, height: int, sweep: str) -> Iterator[Tuple[int, int]]:
+    if sweep == COLUMNS:
+        for x in range(width):
+            for y in range(height) if x % 2 == 0 else range(height - 1, -1, -1):
+                yield x, y
+    else:
+        for y in range(height):
+            for x in range(width) if y % 2 == 0 else range(width - 1, -1, -1):
+                yield x, y
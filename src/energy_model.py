@@ -0,0 +1,100 @@
+from typing import Iterable, List, NamedTuple, Sequence
+
+from src.command_journal import JournalRecord
+
+
+class EnergySample(NamedTuple):
+    """
+    Commands executed between two IBS readings, and how much the charge dropped meanwhile
+    """
+    forwards: int
+    rotations: int
+    cleaning: int  # Commands executed with the cleaning system on
+    drop: float
+
+
+class EnergyModel(NamedTuple):
+    """
+    Charge (in percentage points) used by each command: forward and rotation are the costs of the motor
+    activations, cleaning is the extra cost of a command executed with the cleaning system on
+    """
+    forward: float = 0.0
+    rotation: float = 0.0
+    cleaning: float = 0.0
+
+    def cost(self, commands: str, cleaning: bool = True) -> float:
+        forwards = commands.count('f')
+        rotations = len(commands) - forwards
+        cost = forwards * self.forward + rotations * self.rotation
+        if cleaning:
+            cost += len(commands) * self.cleaning
+        return cost
+
+    @classmethod
+    def fit(cls, samples: Iterable[EnergySample], ridge: float = 1e-6) -> "EnergyModel":
+        """
+        Fits the costs to the samples by (ridge-regularized) least squares. The regularization only matters when
+        the samples cannot tell the costs apart, e.g., when the cleaning system was always on: the costs are then
+        split evenly, which still predicts the cost of the commands correctly under the same conditions
+        """
+        ata = [[0.0] * 3 for _ in range(3)]
+        atb = [0.0] * 3
+        n = 0
+        for sample in samples:
+            row = (sample.forwards, sample.rotations, sample.cleaning)
+            for i in range(3):
+                atb[i] += row[i] * sample.drop
+                for j in range(3):
+                    ata[i][j] += row[i] * row[j]
+            n += 1
+        if not n:
+            raise ValueError("No samples to fit the energy model to")
+        for i in range(3):
+            ata[i][i] += ridge
+        return cls(*_solve(ata, atb))
+
+
+def samples_from_journal(records: Iterable[JournalRecord], cleaning: bool = True) -> List[EnergySample]:
+    """
+    Extracts the energy samples from the records of a command journal: every change of the battery reading
+    is a sample, charged to the commands executed since the previous change. Recharges are skipped
+    :param cleaning: whether the cleaning system was on while executing the commands
+    """
+    samples = []
+    reading = None
+    forwards = rotations = 0
+    for record in records:
+        if record.battery is None or record.low_battery:
+            continue
+        if reading is not None and record.battery != reading:
+            if record.battery < reading:
+                samples.append(EnergySample(forwards, rotations, forwards + rotations if cleaning else 0,
+                                            reading - record.battery))
+            forwards = rotations = 0
+        reading = record.battery
+        if record.command == 'f':
+            forwards += 1
+        else:
+            rotations += 1
+    return samples
+
+
+def _solve(a: Sequence[List[float]], b: List[float]) -> List[float]:
+    """
+    Solves the linear system a x = b by Gaussian elimination with partial pivoting
+    """
+    n = len(b)
+    a = [list(row) + [b[i]] for i, row in enumerate(a)]
+    for column in range(n):
+        pivot = max(range(column, n), key=lambda row: abs(a[row][column]))
+        if a[pivot][column] == 0:
+            raise ValueError("The samples do not determine the energy model")
+        a[column], a[pivot] = a[pivot], a[column]
+        for row in range(column + 1, n):
+            factor = a[row][column] / a[column][column]
+            for k in range(column, n + 1):
+                a[row][k] -= factor * a[column][k]
+    x = [0.0] * n
+    for row in range(n - 1, -1, -1):
+        x[row] = (a[row][n] - sum(a[row][k] * x[k] for k in range(row + 1, n))) / a[row][row]
+    return x
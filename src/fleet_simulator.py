@@ -0,0 +1,114 @@
+from array import array
+from typing import Optional, Sequence
+
+from src.occupancy_grid import OccupancyGrid
+from src.robot_state import HEADINGS, DX, DY, TURN_LEFT, TURN_RIGHT
+from src.route_planner import plan_route
+
+
+class FleetSimulator:
+    """
+    Simulates many virtual robots sharing the same room. The state of the fleet is kept in flat arrays
+    (one slot per robot) and every tick applies one command to each robot with the same rules as
+    CleaningRobot.execute_command: robots at 10% or less answer "!" and stay still, robots at 24% or less
+    go back to the recharge station once, and forward moves towards an obstacle leave the robot in place
+    """
+
+    def __init__(self, size: int, grid: Optional[OccupancyGrid] = None, charge: float = 100.0,
+                 forward_drain: float = 0.0, rotation_drain: float = 0.0):
+        """
+        :param size: the number of robots
+        :param grid: the room, whose obstacles are seen by every robot
+        :param charge: the initial charge of every robot
+        :param forward_drain: the charge used by every forward move
+        :param rotation_drain: the charge used by every rotation
+        """
+        self.size = size
+        self.grid = grid if grid is not None else OccupancyGrid()
+        self.initial_charge = charge
+        self.forward_drain = forward_drain
+        self.rotation_drain = rotation_drain
+        self.reset()
+
+    def reset(self) -> None:
+        size = self.size
+        self.x = array('i', bytes(4 * size))
+        self.y = array('i', bytes(4 * size))
+        self.heading = array('b', bytes(size))
+        self.charge = array('d', [self.initial_charge]) * size
+        self.obstacle_hits = array('i', bytes(4 * size))
+        self.commands = array('i', bytes(4 * size))
+        self.going_back = bytearray(size)
+        self.low_battery = bytearray(size)
+        # Robots that could not reach the recharge station (CleaningRobotError on a real robot)
+        self.error = bytearray(size)
+
+    def step(self, commands: Sequence[str]) -> None:
+        """
+        Applies one command to each robot; a robot whose command is empty (or None) stays idle
+        :param commands: one command per robot
+        """
+        x, y, heading, charge = self.x, self.y, self.heading, self.charge
+        is_obstacle = self.grid.is_obstacle
+        forward_drain, rotation_drain = self.forward_drain, self.rotation_drain
+        for i, command in enumerate(commands):
+            if not command or self.error[i]:
+                continue
+            if charge[i] <= 10:
+                self.low_battery[i] = 1
+                continue
+            self.commands[i] += 1
+            if charge[i] <= 24 and not self.going_back[i]:
+                self.going_back[i] = 1
+                self._go_to_recharge_station(i)
+            elif command == 'f':
+                h = heading[i]
+                new_x = x[i] + DX[h]
+                new_y = y[i] + DY[h]
+                if is_obstacle(new_x, new_y):
+                    self.obstacle_hits[i] += 1
+                else:
+                    x[i] = new_x
+                    y[i] = new_y
+                charge[i] -= forward_drain
+            else:
+                heading[i] = TURN_LEFT[heading[i]] if command == 'l' else TURN_RIGHT[heading[i]]
+                charge[i] -= rotation_drain
+
+    def run(self, routes: Sequence[str]) -> None:
+        """
+        Executes one route (a command string) per robot, tick by tick, until the longest route is over
+        """
+        for tick in range(max(map(len, routes), default=0)):
+            self.step([route[tick] if tick < len(route) else None for route in routes])
+
+    def status(self, i: int) -> str:
+        """
+        Returns the status of the i-th robot in the same format as CleaningRobot.robot_status()
+        """
+        return f"({self.x[i]},{self.y[i]},{HEADINGS[self.heading[i]]})"
+
+    def _go_to_recharge_station(self, i: int) -> None:
+        x, y = self.x[i], self.y[i]
+        grid = self.grid
+        min_x, min_y, max_x, max_y = grid.marked_area() or (0, 0, 0, 0)
+        bounds = (min(min_x, 0, x) - 1, min(min_y, 0, y) - 1, max(max_x, 0, x) + 1, max(max_y, 0, y) + 1)
+        route = plan_route((x, y, HEADINGS[self.heading[i]]), (0, 0), grid.is_obstacle, bounds, goal_heading='E')
+        if route is None:
+            self.error[i] = 1
+            return
+        # The robot drives back command by command, refusing to go on once its battery runs low
+        # (go_to_recharge_station raises a CleaningRobotError on a real robot)
+        charge = self.charge
+        for command in route:
+            if charge[i] <= 10:
+                self.error[i] = 1
+                return
+            h = self.heading[i]
+            if command == 'f':
+                self.x[i] += DX[h]
+                self.y[i] += DY[h]
+                charge[i] -= self.forward_drain
+            else:
+                self.heading[i] = TURN_LEFT[h] if command == 'l' else TURN_RIGHT[h]
+                charge[i] -= self.rotation_drain
@@ -0,0 +1,83 @@
+from typing import Callable, Dict, Optional, Tuple
+
+from src.clock import SystemClock
+
+
+class InfraredSensor:
+    """
+    Debounced reading of the infrared distance sensor: every reading is a burst of samples, and an obstacle is
+    found only if at least threshold of them are HIGH (by default, the majority). The sampling stops as soon as
+    the outcome is decided. The confidence of every cell (the fraction of HIGH samples) is cached, and the cells
+    found clear are not read again for clear_ttl seconds, unless a fresh reading is asked for (as the robot
+    does while moving, since an obstacle may show up at any time).
+    With the defaults (a single sample, no cache) it behaves as a single GPIO.input()
+    """
+
+    def __init__(self, samples: int = 1, threshold: Optional[int] = None, sample_interval: float = 0.0,
+                 clear_ttl: float = 0.0, clock=None):
+        """
+        :param samples: how many times the sensor is read for each reading
+        :param threshold: how many HIGH samples make an obstacle (by default, the majority of the samples)
+        :param sample_interval: seconds waited between two samples
+        :param clear_ttl: how long (in seconds) a cell found clear is trusted without reading the sensor again
+        :param clock: the clock measuring the age of the cached readings (by default, a SystemClock)
+        """
+        if samples < 1:
+            raise ValueError("samples must be positive")
+        self.samples = samples
+        self.threshold = threshold if threshold is not None else samples // 2 + 1
+        if not 1 <= self.threshold <= samples:
+            raise ValueError("threshold must be between 1 and samples")
+        self.sample_interval = sample_interval
+        self.clear_ttl = clear_ttl
+        self.clock = clock if clock is not None else SystemClock()
+
+        # (time of the reading, fraction of HIGH samples) by cell
+        self.confidence: Dict[Tuple[int, int], Tuple[float, float]] = {}
+
+        self.reads = 0
+        self.cache_hits = 0
+
+    def obstacle_found(self, read: Callable[[], int], cell: Tuple[int, int], fresh: bool = False) -> bool:
+        """
+        :param read: reads a sample from the sensor, e.g., a GPIO.input of the infrared pin
+        :param cell: the cell the sensor is facing
+        :param fresh: read the sensor even if the cell was recently found clear, e.g., while the robot is moving
+        """
+        if self.clear_ttl and not fresh:
+            cached = self.confidence.get(cell)
+            if cached is not None and cached[1] == 0.0 and self.clock.now() - cached[0] < self.clear_ttl:
+                self.cache_hits += 1
+                return False
+
+        high = 0
+        taken = 0
+        while taken < self.samples:
+            if taken and self.sample_interval:
+                self.clock.sleep(self.sample_interval)
+            high += 1 if read() else 0
+            taken += 1
+            if high >= self.threshold or high + self.samples - taken < self.threshold:
+                break
+        self.reads += taken
+
+        if self.clear_ttl:
+            self.confidence[cell] = (self.clock.now(), high / taken)
+        return high >= self.threshold
+
+    def cell_confidence(self, cell: Tuple[int, int]) -> Optional[float]:
+        """
+        Returns the fraction of HIGH samples of the last reading of a cell, None if it was not read
+        (or the cache is disabled)
+        """
+        cached = self.confidence.get(cell)
+        return cached[1] if cached is not None else None
+
+    def invalidate(self, cell: Optional[Tuple[int, int]] = None) -> None:
+        """
+        Forgets the cached reading of a cell, or of all the cells
+        """
+        if cell is None:
+            self.confidence.clear()
+        else:
+            self.confidence.pop(cell, None)
@@ -0,0 +1,165 @@
+import asyncio
+import time
+from bisect import bisect_left
+from functools import wraps
+from typing import Callable, List
+
+# Upper bounds (in seconds) of the latency histogram buckets: 1us, 2us, 4us, ... ~17s, plus an overflow bucket
+BUCKET_BOUNDS = tuple(1e-6 * 2 ** i for i in range(25))
+
+
+class LatencyHistogram:
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.counts[bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "max": self.max,
+            "buckets": {bound: count for bound, count in zip(BUCKET_BOUNDS + (float("inf"),), self.counts) if count},
+        }
+
+
+class InstrumentedGPIO:
+    """
+    Proxy of a GPIO module counting the calls to output() and input()
+    """
+
+    def __init__(self, gpio, instrumentation: "Instrumentation"):
+        self.gpio = gpio
+        self.instrumentation = instrumentation
+
+    def output(self, channel, value):
+        self.instrumentation.gpio_outputs += 1
+        return self.gpio.output(channel, value)
+
+    def input(self, channel):
+        self.instrumentation.gpio_inputs += 1
+        return self.gpio.input(channel)
+
+    def __getattr__(self, name):
+        return getattr(self.gpio, name)
+
+
+class InstrumentedIBS:
+    """
+    Proxy of an IBS counting the calls to get_charge_left()
+    """
+
+    def __init__(self, ibs, instrumentation: "Instrumentation"):
+        self.ibs = ibs
+        self.instrumentation = instrumentation
+
+    def get_charge_left(self) -> int:
+        self.instrumentation.ibs_reads += 1
+        return self.ibs.get_charge_left()
+
+    def __getattr__(self, name):
+        return getattr(self.ibs, name)
+
+
+class Instrumentation:
+    """
+    Counters and latency histograms of a CleaningRobot, see CleaningRobot.enable_instrumentation()
+    """
+
+    def __init__(self, timer: Callable[[], float] = time.perf_counter):
+        self.timer = timer
+        self.exporters: List[Callable[[dict], None]] = []
+        self.reset()
+
+    def reset(self) -> None:
+        self.command_latency = {}
+        self.gpio_outputs = 0
+        self.gpio_inputs = 0
+        self.ibs_reads = 0
+        self.recharge_trips = 0
+        self.recharge_time = 0.0
+
+    def record_command(self, command: str, seconds: float) -> None:
+        histogram = self.command_latency.get(command)
+        if histogram is None:
+            histogram = self.command_latency[command] = LatencyHistogram()
+        histogram.record(seconds)
+
+    def record_recharge_trip(self, seconds: float) -> None:
+        self.recharge_trips += 1
+        self.recharge_time += seconds
+
+    def time_command(self, perform_command):
+        """
+        Wraps CleaningRobot.perform_command (or its coroutine counterpart) to record its latency by command type
+        """
+        if asyncio.iscoroutinefunction(perform_command):
+            @wraps(perform_command)
+            async def timed(command):
+                start = self.timer()
+                try:
+                    return await perform_command(command)
+                finally:
+                    self.record_command(command, self.timer() - start)
+        else:
+            @wraps(perform_command)
+            def timed(command):
+                start = self.timer()
+                try:
+                    return perform_command(command)
+                finally:
+                    self.record_command(command, self.timer() - start)
+        return timed
+
+    def time_recharge_trip(self, go_to_recharge_station):
+        """
+        Wraps CleaningRobot.go_to_recharge_station (or its coroutine counterpart) to record the time it takes
+        """
+        if asyncio.iscoroutinefunction(go_to_recharge_station):
+            @wraps(go_to_recharge_station)
+            async def timed():
+                start = self.timer()
+                try:
+                    return await go_to_recharge_station()
+                finally:
+                    self.record_recharge_trip(self.timer() - start)
+        else:
+            @wraps(go_to_recharge_station)
+            def timed():
+                start = self.timer()
+                try:
+                    return go_to_recharge_station()
+                finally:
+                    self.record_recharge_trip(self.timer() - start)
+        return timed
+
+    def add_exporter(self, exporter: Callable[[dict], None]) -> None:
+        """
+        Registers a function receiving the snapshot of the instrumentation on every export()
+        """
+        self.exporters.append(exporter)
+
+    def export(self) -> dict:
+        snapshot = self.snapshot()
+        for exporter in self.exporters:
+            exporter(snapshot)
+        return snapshot
+
+    def snapshot(self) -> dict:
+        return {
+            "command_latency": {command: histogram.snapshot() for command, histogram in self.command_latency.items()},
+            "gpio_outputs": self.gpio_outputs,
+            "gpio_inputs": self.gpio_inputs,
+            "ibs_reads": self.ibs_reads,
+            "recharge_trips": self.recharge_trips,
+            "recharge_time": self.recharge_time,
+        }
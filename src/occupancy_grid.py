@@ -0,0 +1,132 @@
+from typing import Iterator, List, Optional, Tuple
+
+
+class OccupancyGrid:
+    """
+    Map of the room stored as one byte of flags per cell in a row-major bytearray.
+    The grid grows (doubling its size) whenever a cell outside of it is marked, so negative
+    coordinates are supported as well
+    """
+
+    OBSTACLE = 1
+    VISITED = 2
+    CLEANED = 4
+
+    def __init__(self, width: int = 16, height: int = 16, min_x: int = 0, min_y: int = 0):
+        self.width = width
+        self.height = height
+        self.min_x = min_x
+        self.min_y = min_y
+        self._cells = bytearray(width * height)
+
+        # Bounding box of the cells marked so far
+        self._marked = None
+
+    def get(self, x: int, y: int) -> int:
+        """
+        Returns the flags of the cell (x, y), 0 if the cell has never been marked
+        """
+        col = x - self.min_x
+        row = y - self.min_y
+        if 0 <= col < self.width and 0 <= row < self.height:
+            return self._cells[row * self.width + col]
+        return 0
+
+    def mark(self, x: int, y: int, flags: int) -> None:
+        if not (0 <= x - self.min_x < self.width and 0 <= y - self.min_y < self.height):
+            self._grow(x, y)
+        self._cells[(y - self.min_y) * self.width + x - self.min_x] |= flags
+        if self._marked is None:
+            self._marked = [x, y, x, y]
+        else:
+            marked = self._marked
+            if x < marked[0]:
+                marked[0] = x
+            elif x > marked[2]:
+                marked[2] = x
+            if y < marked[1]:
+                marked[1] = y
+            elif y > marked[3]:
+                marked[3] = y
+
+    def unmark(self, x: int, y: int, flags: int) -> None:
+        col = x - self.min_x
+        row = y - self.min_y
+        if 0 <= col < self.width and 0 <= row < self.height:
+            self._cells[row * self.width + col] &= ~flags & 0xFF
+
+    def is_obstacle(self, x: int, y: int) -> bool:
+        return bool(self.get(x, y) & self.OBSTACLE)
+
+    def mark_obstacle(self, x: int, y: int) -> None:
+        self.mark(x, y, self.OBSTACLE)
+
+    def mark_free(self, x: int, y: int, cleaned: bool = False) -> None:
+        """
+        Marks the cell (x, y) as visited (and cleaned, if requested), removing any obstacle recorded there
+        """
+        self.unmark(x, y, self.OBSTACLE)
+        self.mark(x, y, self.VISITED | self.CLEANED if cleaned else self.VISITED)
+
+    def marked_area(self) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Returns the (min_x, min_y, max_x, max_y) bounds of the cells marked so far, None if the grid is empty
+        """
+        return None if self._marked is None else tuple(self._marked)
+
+    def obstacles(self) -> Iterator[Tuple[int, int]]:
+        return self.cells_with(self.OBSTACLE)
+
+    def cells_with(self, flags: int) -> Iterator[Tuple[int, int]]:
+        """
+        Iterates over the cells having all the given flags set
+        """
+        width = self.width
+        for index, value in enumerate(self._cells):
+            if value & flags == flags:
+                yield self.min_x + index % width, self.min_y + index // width
+
+    def uncleaned_cells(self, min_x: int, min_y: int, max_x: int, max_y: int) -> List[Tuple[int, int]]:
+        """
+        Returns the cells of the given region (bounds included) which are neither obstacles nor cleaned
+        """
+        skip = self.OBSTACLE | self.CLEANED
+        cells = []
+        for y in range(min_y, max_y + 1):
+            row = y - self.min_y
+            for x in range(min_x, max_x + 1):
+                col = x - self.min_x
+                if 0 <= row < self.height and 0 <= col < self.width \
+                        and self._cells[row * self.width + col] & skip:
+                    continue
+                cells.append((x, y))
+        return cells
+
+    def _grow(self, x: int, y: int) -> None:
+        min_x = min(self.min_x, x)
+        min_y = min(self.min_y, y)
+        max_x = max(self.min_x + self.width - 1, x)
+        max_y = max(self.min_y + self.height - 1, y)
+        # Grow at least to double size along any stretched axis, so marking a walk costs amortized O(1)
+        if min_x < self.min_x:
+            min_x = min(min_x, max_x + 1 - 2 * self.width)
+        if max_x >= self.min_x + self.width:
+            max_x = max(max_x, min_x + 2 * self.width - 1)
+        if min_y < self.min_y:
+            min_y = min(min_y, max_y + 1 - 2 * self.height)
+        if max_y >= self.min_y + self.height:
+            max_y = max(max_y, min_y + 2 * self.height - 1)
+
+        width = max_x - min_x + 1
+        height = max_y - min_y + 1
+        cells = bytearray(width * height)
+        col = self.min_x - min_x
+        for row in range(self.height):
+            start = (row + self.min_y - min_y) * width + col
+            cells[start:start + self.width] = self._cells[row * self.width:(row + 1) * self.width]
+
+        self._cells = cells
+        self.width = width
+        self.height = height
+        self.min_x = min_x
+        self.min_y = min_y
@@ -0,0 +1,151 @@
+"""
+Line-based server letting the RMS drive an AsyncCleaningRobot over a Unix socket or TCP on localhost.
+
+Every request is a line, answered by a block of lines ended by an empty line:
+    ffrl    a batch of commands: one status line per command executed, e.g., "(0,1,N)" or "(0,1,N),(0,2)";
+            the batch stops early once the robot runs out of battery ("!(0,1,N)") or goes back to recharge
+    ?       the status of the robot, answered right away even while another connection is moving the robot
+Any other line is answered with "ERROR <reason>", and so is a batch interrupted by a CleaningRobotError (e.g., when
+the robot cannot make it back to the recharge station), after the statuses of the commands executed so far. Requests can be pipelined: they are answered in order, and
+the server stops reading from a connection while its batch is executing, so fast clients are slowed down by
+TCP flow control instead of piling up requests in memory.
+
+Usage:
+    python -m src.rms_server [--unix PATH | --port PORT]
+"""
+import argparse
+import asyncio
+from typing import List, Optional
+
+from src.async_cleaning_robot import AsyncCleaningRobot
+from src.cleaning_robot import CleaningRobotError
+
+STATUS_QUERY = '?'
+COMMANDS = frozenset('flr')
+
+# Longest request line accepted, in bytes
+LINE_LIMIT = 64 * 1024
+
+
+class RMSServer:
+
+    def __init__(self, robot: AsyncCleaningRobot):
+        self.robot = robot
+        # Batches from different connections move the same robot, so they are executed one at a time
+        self.lock = asyncio.Lock()
+        self.connections = 0
+        self.commands = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # The line exceeds the limit of the reader
+                    writer.write(b"ERROR line too long\n\n")
+                    break
+                if not line:
+                    break
+                request = line.decode('ascii', 'replace').strip()
+                if request == STATUS_QUERY:
+                    writer.write(f"{self.robot.robot_status()}\n\n".encode())
+                elif request and COMMANDS.issuperset(request):
+                    await self.execute(request, writer)
+                    writer.write(b"\n")
+                else:
+                    writer.write(f"ERROR invalid request {request!r}\n\n".encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def execute(self, commands: str, writer: asyncio.StreamWriter) -> None:
+        async with self.lock:
+            try:
+                async for status in self.robot.execute_commands(commands):
+                    self.commands += 1
+                    writer.write(f"{status}\n".encode())
+                    await writer.drain()
+            except CleaningRobotError as e:
+                writer.write(f"ERROR {e or 'cleaning robot error'}\n".encode())
+
+    async def start(self, path: Optional[str] = None, host: str = '127.0.0.1', port: int = 0) -> asyncio.AbstractServer:
+        """
+        Starts listening on the Unix socket at path if given, otherwise on host:port (port 0 picks a free one)
+        """
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle, path, limit=LINE_LIMIT)
+        return await asyncio.start_server(self.handle, host, port, limit=LINE_LIMIT)
+
+
+class RMSClient:
+    """
+    Stand-in for the RMS: sends requests to an RMSServer and reads back their answers
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, path: Optional[str] = None, host: str = '127.0.0.1', port: int = 0) -> "RMSClient":
+        if path is not None:
+            return cls(*await asyncio.open_unix_connection(path))
+        return cls(*await asyncio.open_connection(host, port))
+
+    async def send(self, request: str) -> None:
+        """
+        Sends a request without waiting for its answer, see receive()
+        """
+        self.writer.write(f"{request}\n".encode())
+        await self.writer.drain()
+
+    async def receive(self) -> List[str]:
+        """
+        Reads the answer to the oldest request sent
+        """
+        lines = []
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                raise ConnectionError("The server closed the connection")
+            line = line.decode().rstrip('\n')
+            if not line:
+                return lines
+            lines.append(line)
+
+    async def execute(self, commands: str) -> List[str]:
+        await self.send(commands)
+        return await self.receive()
+
+    async def status(self) -> str:
+        await self.send(STATUS_QUERY)
+        return (await self.receive())[0]
+
+    async def close(self) -> None:
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def serve(path: Optional[str], port: int) -> None:
+    robot = AsyncCleaningRobot()
+    robot.initialize_robot()
+    server = await RMSServer(robot).start(path, port=port)
+    for socket in server.sockets:
+        print(f"Listening on {socket.getsockname()}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--unix", help="path of the Unix socket to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port to listen on (default: 8765)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.unix, args.port))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,29 @@
+# Headings are encoded as indexes in HEADINGS, clockwise from N
+HEADINGS = ('N', 'E', 'S', 'W')
+HEADING_CODES = {heading: code for code, heading in enumerate(HEADINGS)}
+
+# Position deltas of a forward move, by heading
+DX = (0, 1, 0, -1)
+DY = (1, 0, -1, 0)
+
+# Heading reached by turning left/right, by heading
+TURN_LEFT = (3, 0, 1, 2)
+TURN_RIGHT = (1, 2, 3, 0)
+
+
+class RobotState:
+    """
+    Position and heading of the robot, with the heading encoded as an index in HEADINGS
+    """
+
+    __slots__ = ('x', 'y', 'heading', 'going_back')
+
+    def __init__(self, x: int = None, y: int = None, heading: int = None, going_back: bool = False):
+        self.x = x
+        self.y = y
+        self.heading = heading
+        self.going_back = going_back
+
+    def __repr__(self) -> str:
+        heading = HEADINGS[self.heading] if self.heading is not None else None
+        return f"RobotState({self.x},{self.y},{heading})"
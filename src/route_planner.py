@@ -0,0 +1,77 @@
+import heapq
+from typing import Callable, Optional, Tuple
+
+from src.robot_state import HEADINGS, HEADING_CODES, DX, DY, TURN_LEFT, TURN_RIGHT
+
+FORWARD_COST = 1
+ROTATION_COST = 1
+
+
+def plan_route(start: Tuple[int, int, str], goal: Tuple[int, int], is_blocked: Callable[[int, int], bool],
+               bounds: Tuple[int, int, int, int], goal_heading: Optional[str] = None) -> Optional[str]:
+    """
+    Computes the cheapest collision-free route between two cells with A*, where both moving forward
+    and rotating cost one motor activation
+    :param start: the starting position and heading, e.g., (1, 2, "N")
+    :param goal: the cell to reach, e.g., (0, 0)
+    :param is_blocked: tells whether the cell (x, y) contains an obstacle
+    :param bounds: (min_x, min_y, max_x, max_y), the cells the route can go through
+    :param goal_heading: the heading the robot must have once in the goal cell, if any
+    :return: the route as a command string (e.g., "lff"), or None if the goal cannot be reached
+    """
+    min_x, min_y, max_x, max_y = bounds
+    goal_x, goal_y = goal
+
+    def heuristic(x: int, y: int) -> int:
+        dx = abs(goal_x - x)
+        dy = abs(goal_y - y)
+        return (dx + dy) * FORWARD_COST + (ROTATION_COST if dx and dy else 0)
+
+    start_x, start_y, start_heading = start
+    start_state = (start_x, start_y, HEADING_CODES[start_heading])
+    came_from = {start_state: None}
+    cost = {start_state: 0}
+    frontier = [(heuristic(start_x, start_y), 0, start_state)]
+
+    while frontier:
+        _, g, state = heapq.heappop(frontier)
+        if g > cost[state]:
+            continue
+        x, y, h = state
+        if (x, y) == goal and (goal_heading is None or HEADINGS[h] == goal_heading):
+            return _commands_to(state, came_from)
+
+        successors = [((x, y, TURN_LEFT[h]), 'l', ROTATION_COST),
+                      ((x, y, TURN_RIGHT[h]), 'r', ROTATION_COST)]
+        nx, ny = x + DX[h], y + DY[h]
+        if min_x <= nx <= max_x and min_y <= ny <= max_y and not is_blocked(nx, ny):
+            successors.append(((nx, ny, h), 'f', FORWARD_COST))
+
+        for successor, command, step_cost in successors:
+            new_cost = g + step_cost
+            if new_cost < cost.get(successor, new_cost + 1):
+                cost[successor] = new_cost
+                came_from[successor] = (state, command)
+                heapq.heappush(frontier, (new_cost + heuristic(successor[0], successor[1]), new_cost, successor))
+    return None
+
+
+def apply_command(state: Tuple[int, int, str], command: str) -> Tuple[int, int, str]:
+    """
+    Returns the position and heading reached by executing a command from the given state, assuming no obstacles
+    """
+    x, y, heading = state
+    h = HEADING_CODES[heading]
+    if command == 'f':
+        return x + DX[h], y + DY[h], heading
+    if command == 'l':
+        return x, y, HEADINGS[TURN_LEFT[h]]
+    return x, y, HEADINGS[TURN_RIGHT[h]]
+
+
+def _commands_to(state, came_from) -> str:
+    commands = []
+    while came_from[state] is not None:
+        state, command = came_from[state]
+        commands.append(command)
+    return ''.join(reversed(commands))
@@ -0,0 +1,167 @@
+import random
+from itertools import islice
+from multiprocessing import Pool
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+from src.cleaning_robot import CleaningRobot, CleaningRobotError
+from src.coverage_planner import plan_coverage
+
+
+class Scenario(NamedTuple):
+    seed: int
+    width: int
+    height: int
+    obstacles: frozenset
+    initial_charge: float
+    forward_drain: float
+    rotation_drain: float
+
+
+class Outcome(NamedTuple):
+    # Whether the whole route was executed without being interrupted by a trip to the recharge station
+    completed: bool
+    returned: bool
+    error: bool
+    commands_before_low_battery: Optional[int]
+
+
+class SimulatedIBS:
+    """
+    IBS reporting a settable charge, which SimulatedRobot lowers every time it activates a motor
+    """
+
+    def __init__(self, charge: float):
+        self.charge = charge
+
+    def get_charge_left(self) -> int:
+        return int(self.charge)
+
+
+class SimulatedRobot(CleaningRobot):
+    """
+    CleaningRobot running against the mock backend in a scenario room: the walls of the room and its
+    obstacles are seen by the infrared sensor, and the motors drain a SimulatedIBS
+    """
+
+    def __init__(self, scenario: Scenario):
+        super().__init__()
+        self.scenario = scenario
+        self.ibs = SimulatedIBS(scenario.initial_charge)
+        self.battery.ibs = self.ibs
+
+    def obstacle_found(self, fresh: bool = False) -> bool:
+        x, y = self.cell_ahead()
+        return not (0 <= x < self.scenario.width and 0 <= y < self.scenario.height) \
+            or (x, y) in self.scenario.obstacles
+
+    def activate_wheel_motor(self) -> None:
+        super().activate_wheel_motor()
+        self.ibs.charge -= self.scenario.forward_drain
+
+    def activate_rotation_motor(self, direction) -> None:
+        super().activate_rotation_motor(direction)
+        self.ibs.charge -= self.scenario.rotation_drain
+
+
+class ScenarioStats:
+
+    def __init__(self):
+        self.runs = 0
+        self.completed = 0
+        self.returned = 0
+        self.errors = 0
+        self.low_battery_runs = 0
+        self.commands_before_low_battery = 0
+
+    def add(self, outcome: Outcome) -> None:
+        self.runs += 1
+        self.completed += outcome.completed
+        self.returned += outcome.returned
+        self.errors += outcome.error
+        if outcome.commands_before_low_battery is not None:
+            self.low_battery_runs += 1
+            self.commands_before_low_battery += outcome.commands_before_low_battery
+
+    def merge(self, other: "ScenarioStats") -> None:
+        self.runs += other.runs
+        self.completed += other.completed
+        self.returned += other.returned
+        self.errors += other.errors
+        self.low_battery_runs += other.low_battery_runs
+        self.commands_before_low_battery += other.commands_before_low_battery
+
+    def completion_rate(self) -> float:
+        return self.completed / self.runs if self.runs else 0.0
+
+    def error_rate(self) -> float:
+        """
+        Returns the rate of runs where go_to_recharge_station raised a CleaningRobotError
+        """
+        return self.errors / self.runs if self.runs else 0.0
+
+    def mean_commands_before_low_battery(self) -> Optional[float]:
+        if not self.low_battery_runs:
+            return None
+        return self.commands_before_low_battery / self.low_battery_runs
+
+
+def random_scenarios(count: int, seed: int = 0, max_size: int = 12, obstacle_density: float = 0.1,
+                     initial_charge: float = 100.0) -> Iterator[Scenario]:
+    """
+    Lazily generates scenarios with random room sizes, obstacle placements and discharge rates
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        width = rng.randint(2, max_size)
+        height = rng.randint(2, max_size)
+        obstacles = frozenset((x, y) for x in range(width) for y in range(height)
+                              if (x, y) != (0, 0) and rng.random() < obstacle_density)
+        yield Scenario(seed + i, width, height, obstacles, initial_charge,
+                       rng.uniform(0.1, 2.0), rng.uniform(0.05, 1.0))
+
+
+def run_scenario(scenario: Scenario) -> Outcome:
+    """
+    Sends a SimulatedRobot, one command at a time, along a coverage route of the scenario room
+    planned without knowing its obstacles. Once back from the recharge station, the robot goes on with
+    the rest of the route from there, so the cells it was heading to are not cleaned: the run does not
+    count as completed
+    """
+    robot = SimulatedRobot(scenario)
+    robot.initialize_robot()
+    executed = 0
+    try:
+        for command in plan_coverage(scenario.width, scenario.height):
+            if robot.execute(command).low_battery:
+                return Outcome(False, robot.goingBackToRechargeStation, False, executed)
+            executed += 1
+    except CleaningRobotError:
+        return Outcome(False, True, True, None)
+    returned = robot.goingBackToRechargeStation
+    return Outcome(not returned, returned, False, None)
+
+
+def run_scenarios(scenarios: Iterable[Scenario], processes: Optional[int] = None, chunksize: int = 64,
+                  batch_size: int = 4096) -> ScenarioStats:
+    """
+    Runs the scenarios on a pool of processes and merges their outcomes as they come back.
+    Scenarios are submitted batch_size at a time, so memory stays flat however many of them there are
+    :param scenarios: the scenarios to run, possibly a lazy iterator
+    :param processes: the number of worker processes (by default, one per CPU); 1 runs everything in this process
+    :param chunksize: the number of scenarios sent to a worker at once
+    :param batch_size: the maximum number of scenarios in flight
+    """
+    stats = ScenarioStats()
+    scenarios = iter(scenarios)
+    if processes == 1:
+        for scenario in scenarios:
+            stats.add(run_scenario(scenario))
+        return stats
+    with Pool(processes) as pool:
+        while True:
+            batch = list(islice(scenarios, batch_size))
+            if not batch:
+                break
+            for outcome in pool.imap_unordered(run_scenario, batch, chunksize):
+                stats.add(outcome)
+    return stats
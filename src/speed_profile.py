@@ -0,0 +1,39 @@
+from typing import NamedTuple, Optional, Tuple
+
+
+class SpeedProfile(NamedTuple):
+    """
+    How a motor is driven through PWM (duty cycles from 0 to 100): it goes through the ramp_up duty cycles
+    before reaching its cruise speed and through the ramp_down ones before stopping, each for step_time seconds.
+    On straight runs, the wheel motor cruises at boost while at least boost_after cells are left to go,
+    slowing down to cruise for the last ones so the infrared sensor gets the usual time to see obstacles
+    """
+    cruise: float = 100.0
+    ramp_up: Tuple[float, ...] = ()
+    ramp_down: Tuple[float, ...] = ()
+    step_time: float = 0.05
+    boost: Optional[float] = None
+    boost_after: int = 3
+
+    def speed(self, cells_left: int) -> float:
+        """
+        Returns the duty cycle for a cell of a straight run
+        :param cells_left: the cells left to go in the run, including the current one
+        """
+        if self.boost is not None and cells_left >= self.boost_after:
+            return self.boost
+        return self.cruise
+
+    def cell_time(self, duty_cycle: float, cruise_time: float) -> float:
+        """
+        Returns how long the robot takes to cross a cell at the given duty cycle
+        :param cruise_time: how long the robot takes to cross a cell at the cruise speed
+        """
+        return cruise_time * self.cruise / duty_cycle
+
+
+def linear_ramp(start: float, end: float, steps: int) -> Tuple[float, ...]:
+    """
+    Returns the duty cycles of a ramp going linearly from start to end (both excluded) in the given number of steps
+    """
+    return tuple(start + (end - start) * i / (steps + 1) for i in range(1, steps + 1))
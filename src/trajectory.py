@@ -0,0 +1,174 @@
+from array import array
+from typing import Iterator, Tuple
+
+from src.command_optimizer import CommandOptimizer
+from src.robot_state import HEADINGS, DX, DY, TURN_LEFT, TURN_RIGHT
+
+# Step codes, packed 4 per byte
+MOVED = 0    # Moved forward by one cell
+BLOCKED = 1  # Tried to move forward, but an obstacle was in the way
+LEFT = 2
+RIGHT = 3
+
+STEP_COMMANDS = ('f', 'f', 'l', 'r')
+
+
+class Trajectory:
+    """
+    The last capacity steps of the robot, in constant memory: every step is stored as a 2-bit code in a ring
+    buffer, and the absolute state of the robot is saved every checkpoint_interval steps, so any past state is
+    rebuilt by replaying at most checkpoint_interval steps
+    """
+
+    def __init__(self, capacity: int = 4096, checkpoint_interval: int = 64, x: int = 0, y: int = 0, heading: int = 0):
+        if capacity < 1 or checkpoint_interval < 1:
+            raise ValueError("capacity and checkpoint_interval must be positive")
+        self.capacity = capacity
+        self.checkpoint_interval = checkpoint_interval
+        self.steps = bytearray((capacity + 3) // 4)
+        # Enough checkpoints to cover the steps in the buffer plus the current one
+        self.checkpoint_slots = capacity // checkpoint_interval + 2
+        self.checkpoint_x = array('i', bytes(4 * self.checkpoint_slots))
+        self.checkpoint_y = array('i', bytes(4 * self.checkpoint_slots))
+        self.checkpoint_heading = bytearray(self.checkpoint_slots)
+        self.reset(x, y, heading)
+
+    def reset(self, x: int = 0, y: int = 0, heading: int = 0) -> None:
+        """
+        Forgets all the steps, starting over from the given state
+        """
+        self.total = 0  # Steps recorded since the reset, including the ones overwritten since
+        self.x = x
+        self.y = y
+        self.heading = heading
+        self._checkpoint()
+
+    def record(self, code: int) -> None:
+        """
+        Appends a step (MOVED, BLOCKED, LEFT or RIGHT) and updates the current state accordingly
+        """
+        index = self.total % self.capacity
+        shift = (index & 3) * 2
+        self.steps[index >> 2] = self.steps[index >> 2] & ~(3 << shift) | code << shift
+        self.total += 1
+        self.x, self.y, self.heading = _apply(self.x, self.y, self.heading, code)
+        if self.total % self.checkpoint_interval == 0:
+            self._checkpoint()
+
+    def __len__(self) -> int:
+        """
+        Returns the number of steps in the buffer
+        """
+        return min(self.total, self.capacity)
+
+    def code(self, step: int) -> int:
+        """
+        Returns the code of a step, given its absolute index since the reset
+        """
+        index = step % self.capacity
+        return self.steps[index >> 2] >> (index & 3) * 2 & 3
+
+    def state_at(self, steps_back: int) -> Tuple[int, int, str]:
+        """
+        Returns the position and heading of the robot steps_back steps ago (0 is the current state)
+        """
+        if not 0 <= steps_back <= len(self):
+            raise IndexError(steps_back)
+        x, y, heading = self._state(self.total - steps_back)
+        return x, y, HEADINGS[heading]
+
+    def __iter__(self) -> Iterator[Tuple[int, int, str]]:
+        """
+        Iterates over the states of the robot from the oldest one in the buffer to the current one
+        """
+        x, y, heading = self._state(self.total - len(self))
+        yield x, y, HEADINGS[heading]
+        for step in range(self.total - len(self), self.total):
+            x, y, heading = _apply(x, y, heading, self.code(step))
+            yield x, y, HEADINGS[heading]
+
+    def backwards(self) -> Iterator[Tuple[int, int, str]]:
+        """
+        Iterates over the states of the robot from the current one back to the oldest one in the buffer
+        """
+        x, y, heading = self.x, self.y, self.heading
+        yield x, y, HEADINGS[heading]
+        for step in range(self.total - 1, self.total - len(self) - 1, -1):
+            x, y, heading = _undo(x, y, heading, self.code(step))
+            yield x, y, HEADINGS[heading]
+
+    def commands(self, steps_back: int) -> str:
+        """
+        Returns the commands of the last steps_back steps, in the order they were executed
+        """
+        if not 0 <= steps_back <= len(self):
+            raise IndexError(steps_back)
+        return ''.join(STEP_COMMANDS[self.code(step)] for step in range(self.total - steps_back, self.total))
+
+    def reverse_commands(self, steps_back: int) -> str:
+        """
+        Returns the commands retracing the path of the last steps_back steps, bringing the robot back to the
+        position and heading it had steps_back steps ago: turn around, replay the moves backwards swapping left
+        and right, and turn around again. Blocked moves are skipped, and rotations are collapsed
+        """
+        if not 0 <= steps_back <= len(self):
+            raise IndexError(steps_back)
+        swapped = {MOVED: 'f', BLOCKED: '', LEFT: 'r', RIGHT: 'l'}
+        reversed_steps = ''.join(swapped[self.code(step)]
+                                 for step in range(self.total - 1, self.total - steps_back - 1, -1))
+        if 'f' not in reversed_steps:
+            # No need to turn around: undoing the rotations is enough
+            return CommandOptimizer().optimize(reversed_steps)
+        return CommandOptimizer().optimize('ll' + reversed_steps + 'll')
+
+    def _checkpoint(self) -> None:
+        slot = self.total // self.checkpoint_interval % self.checkpoint_slots
+        self.checkpoint_x[slot] = self.x
+        self.checkpoint_y[slot] = self.y
+        self.checkpoint_heading[slot] = self.heading
+
+    def _checkpoint_state(self, step: int) -> Tuple[int, int, int]:
+        slot = step // self.checkpoint_interval % self.checkpoint_slots
+        return self.checkpoint_x[slot], self.checkpoint_y[slot], self.checkpoint_heading[slot]
+
+    def _state(self, step: int) -> Tuple[int, int, int]:
+        """
+        Rebuilds the state after the given number of steps since the reset, which must be in the buffer
+        """
+        checkpoint = step - step % self.checkpoint_interval
+        if checkpoint >= self.total - len(self):
+            x, y, heading = self._checkpoint_state(checkpoint)
+            for s in range(checkpoint, step):
+                x, y, heading = _apply(x, y, heading, self.code(s))
+            return x, y, heading
+        # The steps since the previous checkpoint were overwritten: undo the ones before the next checkpoint
+        # (or the current state, if there is none yet)
+        checkpoint += self.checkpoint_interval
+        if checkpoint <= self.total:
+            x, y, heading = self._checkpoint_state(checkpoint)
+        else:
+            checkpoint = self.total
+            x, y, heading = self.x, self.y, self.heading
+        for s in range(checkpoint - 1, step - 1, -1):
+            x, y, heading = _undo(x, y, heading, self.code(s))
+        return x, y, heading
+
+
+def _apply(x: int, y: int, heading: int, code: int) -> Tuple[int, int, int]:
+    if code == MOVED:
+        return x + DX[heading], y + DY[heading], heading
+    if code == LEFT:
+        return x, y, TURN_LEFT[heading]
+    if code == RIGHT:
+        return x, y, TURN_RIGHT[heading]
+    return x, y, heading
+
+
+def _undo(x: int, y: int, heading: int, code: int) -> Tuple[int, int, int]:
+    if code == MOVED:
+        return x - DX[heading], y - DY[heading], heading
+    if code == LEFT:
+        return x, y, TURN_RIGHT[heading]
+    if code == RIGHT:
+        return x, y, TURN_LEFT[heading]
+    return x, y, heading
@@ -0,0 +1,133 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import Mock, patch
+
+from mock import GPIO
+from mock.ibs import IBS
+from src.async_cleaning_robot import AsyncCleaningRobot
+from src.cleaning_robot import CleaningRobotError
+from src.clock import VirtualClock
+from src.infrared_sensor import InfraredSensor
+from src.speed_profile import SpeedProfile
+
+
+class TestAsyncCleaningRobot(IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        setUp_mock_ibs = patch.object(IBS, "get_charge_left", return_value=25)
+        setUp_mock_ibs.start()
+        self.addCleanup(setUp_mock_ibs.stop)
+
+    async def test_execute_command_move_forward(self):
+        robot = AsyncCleaningRobot()
+        robot.initialize_robot()
+        self.assertEqual(await robot.execute_command(robot.FORWARD), '(0,1,N)')
+
+    async def test_execute_command_rotate(self):
+        robot = AsyncCleaningRobot()
+        robot.initialize_robot()
+        await robot.execute_command(robot.LEFT)
+        self.assertEqual(await robot.execute_command(robot.LEFT), '(0,0,S)')
+
+    @patch.object(GPIO, "input")
+    async def test_execute_command_with_obstacle(self, mock_input: Mock):
+        mock_input.return_value = True
+        robot = AsyncCleaningRobot()
+        robot.initialize_robot()
+        self.assertEqual(await robot.execute_command(robot.FORWARD), '(0,0,N),(0,1)')
+
+    @patch.object(IBS, 'get_charge_left')
+    async def test_execute_command_with_low_battery(self, mock_ibs: Mock):
+        mock_ibs.return_value = 10
+        robot = AsyncCleaningRobot()
+        robot.initialize_robot()
+        self.assertEqual(await robot.execute_command(robot.FORWARD), '!(0,0,N)')
+
+    @patch.object(IBS, 'get_charge_left')
+    async def test_execute_command_going_to_recharge_station(self, mock_ibs: Mock):
+        mock_ibs.return_value = 24
+        robot = AsyncCleaningRobot()
+        robot.initialize_robot()
+        robot.pos_x = 1
+        robot.pos_y = 1
+        await robot.execute_command(robot.FORWARD)
+        self.assertEqual(robot.robot_status(), '(0,0,E)')
+
+    @patch.object(GPIO, "input")
+    async def test_go_to_recharge_station_with_obstacle(self, mock_input: Mock):
+        mock_input.return_value = True
+        robot = AsyncCleaningRobot()
+        robot.initialize_robot()
+        robot.pos_x = 1
+        with self.assertRaises(CleaningRobotError):
+            await robot.go_to_recharge_station()
+
+    async def test_execute_commands(self):
+        robot = AsyncCleaningRobot()
+        robot.initialize_robot()
+        self.assertEqual([status async for status in robot.execute_commands("frf")], ['(0,1,N)', '(0,1,E)', '(1,1,E)'])
+
+    @patch("src.cleaning_robot.DEPLOYMENT", True)
+    async def test_motors_do_not_block_the_event_loop(self):
+        robot = AsyncCleaningRobot()
+        robot.MOTOR_ACTIVATION_TIME = 0.1
+        robot.initialize_robot()
+        command = asyncio.create_task(robot.execute_command(robot.FORWARD))
+        await asyncio.sleep(0.02)
+        self.assertEqual(robot.robot_status(), '(0,0,N)')
+        self.assertEqual(await command, '(0,1,N)')
+
+    @patch("src.cleaning_robot.DEPLOYMENT", True)
+    @patch.object(GPIO, "input")
+    async def test_wheel_motor_stops_early_on_obstacle(self, mock_input: Mock):
+        mock_input.side_effect = [False, True, True]
+        robot = AsyncCleaningRobot()
+        robot.MOTOR_ACTIVATION_TIME = 10.0
+        robot.OBSTACLE_POLL_INTERVAL = 0.01
+        robot.initialize_robot()
+        self.assertEqual(await asyncio.wait_for(robot.execute_command(robot.FORWARD), 1.0), '(0,0,N),(0,1)')
+
+    @patch("src.cleaning_robot.DEPLOYMENT", True)
+    @patch.object(GPIO, "input")
+    async def test_wheel_motor_polls_ignore_cells_found_clear(self, mock_input: Mock):
+        mock_input.side_effect = [False, False, True, True]
+        robot = AsyncCleaningRobot()
+        robot.infrared = InfraredSensor(clear_ttl=60)
+        robot.MOTOR_ACTIVATION_TIME = 10.0
+        robot.OBSTACLE_POLL_INTERVAL = 0.01
+        robot.initialize_robot()
+        self.assertFalse(robot.obstacle_found())
+        self.assertEqual(await asyncio.wait_for(robot.execute_command(robot.FORWARD), 1.0), '(0,0,N),(0,1)')
+
+    async def test_execute_commands_in_virtual_time(self):
+        clock = VirtualClock()
+        robot = AsyncCleaningRobot()
+        robot.use_clock(clock)
+        robot.initialize_robot()
+        statuses = [status async for status in robot.execute_commands('frf')]
+        self.assertEqual(statuses, ['(0,1,N)', '(0,1,E)', '(1,1,E)'])
+        self.assertEqual(clock.now(), 3 * robot.MOTOR_ACTIVATION_TIME)
+
+    @patch("src.cleaning_robot.DEPLOYMENT", True)
+    async def test_speed_ramps_do_not_block_the_event_loop(self):
+        robot = AsyncCleaningRobot()
+        robot.initialize_robot()
+        robot.MOTOR_ACTIVATION_TIME = 0.01
+        robot.enable_speed_control(SpeedProfile(cruise=60, ramp_up=(20, 40), ramp_down=(30,), step_time=0.05),
+                                   SpeedProfile(cruise=80, ramp_up=(40,), ramp_down=(40,), step_time=0.05))
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        self.assertEqual(await robot.execute_command(robot.FORWARD), '(0,1,N)')
+        self.assertEqual(await robot.execute_command(robot.RIGHT), '(0,1,E)')
+        ticker.cancel()
+        # The ramps alone last 0.3s: the ticker keeps running meanwhile
+        self.assertGreaterEqual(ticks, 15)
+        self.assertEqual(robot.wheel_pwm.dutycycles(), [0, 20, 40, 60, 30, 0])
+        self.assertEqual(robot.rotation_pwm.dutycycles(), [0, 40, 80, 40, 0])
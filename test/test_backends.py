@@ -0,0 +1,38 @@
+import os
+from unittest import TestCase
+from unittest.mock import patch
+
+import mock.GPIO
+from src.backends import Backend, BACKENDS, BACKEND_ENV, BackendError, backend_name, load_backend, register_backend
+
+
+class TestBackends(TestCase):
+
+    def test_load_mock_backend(self):
+        backend = load_backend("mock")
+        self.assertIs(backend.gpio, mock.GPIO)
+        self.assertFalse(backend.deployment)
+
+    @patch.dict(os.environ, {BACKEND_ENV: "mock"})
+    def test_backend_selected_by_environment(self):
+        self.assertEqual(backend_name(), "mock")
+
+    @patch.dict(os.environ, {BACKEND_ENV: "auto"})
+    @patch("src.backends.importlib.util.find_spec", return_value=None)
+    def test_auto_falls_back_to_mock_without_rpi(self, mock_find_spec):
+        self.assertEqual(backend_name(), "mock")
+        mock_find_spec.assert_called_once_with("RPi")
+
+    @patch("src.backends.importlib.util.find_spec", return_value=object())
+    def test_auto_selects_hardware_with_rpi(self, mock_find_spec):
+        self.assertEqual(backend_name("auto"), "hardware")
+
+    def test_unknown_backend(self):
+        self.assertRaises(BackendError, load_backend, "nonexistent")
+
+    def test_missing_driver_is_an_error(self):
+        self.addCleanup(BACKENDS.pop, "broken")
+        register_backend("broken", Backend("mock.GPIO", "mock.board", "no_such_ibs_driver", deployment=True))
+        with self.assertRaises(BackendError) as context:
+            load_backend("broken")
+        self.assertIn("no_such_ibs_driver", str(context.exception))
@@ -0,0 +1,52 @@
+from unittest import TestCase
+from unittest.mock import Mock
+
+from src.battery_monitor import BatteryMonitor
+from src.clock import VirtualClock
+
+
+class TestBatteryMonitor(TestCase):
+
+    def setUp(self):
+        self.ibs = Mock()
+        self.ibs.get_charge_left.return_value = 80
+
+    def test_without_max_age_always_reads_the_ibs(self):
+        battery = BatteryMonitor(self.ibs)
+        battery.get_charge_left()
+        battery.get_charge_left()
+        self.assertEqual(self.ibs.get_charge_left.call_count, 2)
+
+    def test_reading_is_reused_while_younger_than_max_age(self):
+        clock = VirtualClock()
+        battery = BatteryMonitor(self.ibs, max_age=1.0, clock=clock)
+        battery.get_charge_left()
+        clock.advance(0.5)
+        battery.get_charge_left()
+        clock.advance(0.4)
+        self.assertEqual(battery.get_charge_left(), 80)
+        self.assertEqual((battery.hits, battery.misses), (2, 1))
+
+    def test_reading_is_refreshed_when_older_than_max_age(self):
+        clock = VirtualClock()
+        battery = BatteryMonitor(self.ibs, max_age=1.0, clock=clock)
+        battery.get_charge_left()
+        clock.advance(1.5)
+        self.ibs.get_charge_left.return_value = 70
+        self.assertEqual(battery.get_charge_left(), 70)
+        self.assertEqual((battery.hits, battery.misses), (0, 2))
+
+    def test_reading_near_recharge_threshold_is_always_refreshed(self):
+        self.ibs.get_charge_left.return_value = 29
+        battery = BatteryMonitor(self.ibs, max_age=60.0)
+        battery.get_charge_left()
+        self.ibs.get_charge_left.return_value = 24
+        self.assertEqual(battery.get_charge_left(), 24)
+        self.assertEqual(battery.misses, 2)
+
+    def test_invalidate_forces_a_new_read(self):
+        battery = BatteryMonitor(self.ibs, max_age=60.0)
+        battery.get_charge_left()
+        battery.invalidate()
+        battery.get_charge_left()
+        self.assertEqual(battery.misses, 2)
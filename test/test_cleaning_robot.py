@@ -1,9 +1,13 @@
+import threading
+import time
+from itertools import islice
 from unittest import TestCase
 from unittest.mock import Mock, patch, call
 
 from mock import GPIO
 from mock.ibs import IBS
 from src.cleaning_robot import CleaningRobot, CleaningRobotError
+from src.command_result import CommandResult
 
 
 class TestCleaningRobot(TestCase):
@@ -186,4 +190,223 @@ class TestCleaningRobot(TestCase):
         robot.pos_x = 1
         robot.pos_y = 1
         robot.execute_command(robot.FORWARD)
-        self.assertEqual(robot.robot_status(), '(0,0,E)')
\ No newline at end of file
+        self.assertEqual(robot.robot_status(), '(0,0,E)')
+
+    def test_execute_commands_yields_status_after_each_command(self):
+        robot = CleaningRobot()
+        robot.initialize_robot()
+        self.assertEqual(list(robot.execute_commands("ffrf")), ['(0,1,N)', '(0,2,N)', '(0,2,E)', '(1,2,E)'])
+
+    @patch.object(IBS, 'get_charge_left')
+    def test_execute_commands_reads_battery_once_per_window(self, mock_ibs: Mock):
+        mock_ibs.return_value = 50
+        robot = CleaningRobot()
+        robot.initialize_robot()
+        list(robot.execute_commands("ffffff", battery_check_window=3))
+        self.assertEqual(mock_ibs.call_count, 2)
+
+    @patch.object(GPIO, 'output')
+    @patch.object(IBS, 'get_charge_left')
+    def test_execute_commands_stops_with_low_battery(self, mock_ibs: Mock, mock_gpio: Mock):
+        mock_ibs.side_effect = [50, 10, 10]
+        robot = CleaningRobot()
+        robot.initialize_robot()
+        self.assertEqual(list(robot.execute_commands("ffff", battery_check_window=2)), ['(0,1,N)', '(0,2,N)', '!(0,2,N)'])
+
+    @patch.object(IBS, 'get_charge_left')
+    def test_execute_commands_stops_after_going_to_recharge_station(self, mock_ibs: Mock):
+        mock_ibs.side_effect = [50, 24] + [24] * 20
+        robot = CleaningRobot()
+        robot.initialize_robot()
+        self.assertEqual(list(robot.execute_commands("ffff")), ['(0,1,N)', '(0,0,E)'])
+
+    def test_execute_commands_with_invalid_battery_check_window(self):
+        robot = CleaningRobot()
+        robot.initialize_robot()
+        self.assertRaises(CleaningRobotError, list, robot.execute_commands("f", battery_check_window=0))
+
+    @patch.object(IBS, 'get_charge_left')
+    def test_execute_command_reuses_cached_battery_reading(self, mock_ibs: Mock):
+        mock_ibs.return_value = 80
+        robot = CleaningRobot()
+        robot.initialize_robot()
+        robot.battery.max_age = 60.0
+        robot.execute_command(robot.FORWARD)
+        robot.execute_command(robot.FORWARD)
+        self.assertEqual(mock_ibs.call_count, 1)
+
+    @patch.object(GPIO, "input")
+    def test_execute_command_remembers_obstacle(self, mock_input):
+        mock_input.return_value = True
+        robot = CleaningRobot()
+        robot.initialize_robot()
+        robot.execute_command(robot.FORWARD)
+        self.assertTrue(robot.grid.is_obstacle(0, 1))
+
+    def test_go_to_recharge_station_around_known_obstacle(self):
+        robot = CleaningRobot()
+        robot.initialize_robot()
+        robot.pos_y = 2
+        robot.heading = robot.S
+        robot.grid.mark_obstacle(0, 1)
+        robot.go_to_recharge_station()
+        self.assertEqual(robot.robot_status(), '(0,0,E)')
+
+    @patch.object(GPIO, "input")
+    def test_go_to_recharge_station_replans_when_new_obstacle_found(self, mock_input):
+        mock_input.side_effect = lambda channel: robot.heading == robot.W and (robot.pos_x, robot.pos_y) == (1, 2)
+        robot = CleaningRobot()
+        robot.initialize_robot()
+        robot.pos_x = 1
+        robot.pos_y = 2
+        robot.go_to_recharge_station()
+        self.assertEqual(robot.robot_status(), '(0,0,E)')
+        self.assertTrue(robot.grid.is_obstacle(0, 2))
+
+    def test_execute_command_marks_cleaned_cells(self):
+        robot = CleaningRobot()
+        robot.manage_cleaning_system()
+        robot.initialize_robot()
+        robot.execute_command(robot.FORWARD)
+        self.assertEqual(robot.grid.uncleaned_cells(0, 0, 0, 2), [(0, 2)])
+
+    @patch.object(GPIO, "output")
+    def test_activate_wheel_motor_writes_pins_in_groups(self, mock_gpio: Mock):
+        robot = CleaningRobot()
+        robot.activate_wheel_motor()
+        mock_gpio.assert_has_calls([call((robot.AIN1, robot.AIN2, robot.PWMA, robot.STBY), (GPIO.HIGH, GPIO.LOW, GPIO.HIGH, GPIO.HIGH)),
+                                    call((robot.AIN1, robot.AIN2, robot.PWMA, robot.STBY), GPIO.LOW)])
+        self.assertEqual(mock_gpio.call_count, 2)
+
+    @patch.object(GPIO, "output")
+    def test_activate_rotation_motor_left_writes_pins_in_groups(self, mock_gpio: Mock):
+        robot = CleaningRobot()
+        robot.activate_rotation_motor(robot.LEFT)
+        mock_gpio.assert_has_calls([call((robot.BIN1, robot.BIN2, robot.PWMB, robot.STBY), (GPIO.HIGH, GPIO.LOW, GPIO.HIGH, GPIO.HIGH)),
+                                    call((robot.BIN1, robot.BIN2, robot.PWMB, robot.STBY), GPIO.LOW)])
+
+    @patch.object(GPIO, "output")
+    def test_activate_rotation_motor_right_writes_pins_in_groups(self, mock_gpio: Mock):
+        robot = CleaningRobot()
+        robot.activate_rotation_motor(robot.RIGHT)
+        mock_gpio.assert_has_calls([call((robot.BIN1, robot.BIN2, robot.PWMB, robot.STBY), (GPIO.LOW, GPIO.HIGH, GPIO.HIGH, GPIO.HIGH)),
+                                    call((robot.BIN1, robot.BIN2, robot.PWMB, robot.STBY), GPIO.LOW)])
+
+    def test_execute_command_with_scripted_infrared_input(self):
+        GPIO.script_input(CleaningRobot.INFRARED_PIN, [False, True])
+        self.addCleanup(GPIO.reset)
+        robot = CleaningRobot()
+        robot.initialize_robot()
+        self.assertEqual([robot.execute_command(robot.FORWARD) for _ in range(2)], ['(0,1,N)', '(0,1,N),(0,2)'])
+
+    def test_heading_is_stored_encoded(self):
+        robot = CleaningRobot()
+        robot.initialize_robot()
+        robot.heading = robot.S
+        self.assertEqual(robot.state.heading, 2)
+        self.assertEqual(robot.heading, robot.S)
+
+    @patch.object(GPIO, "input")
+    def test_execute_returns_structured_result(self, mock_input: Mock):
+        mock_input.return_value = True
+        robot = CleaningRobot()
+        robot.initialize_robot()
+        self.assertEqual(robot.execute(robot.FORWARD), CommandResult(0, 0, 'N', obstacle=(0, 1)))
+
+    @patch.object(GPIO, 'output')
+    @patch.object(IBS, 'get_charge_left')
+    def test_execute_with_low_battery_returns_structured_result(self, mock_ibs: Mock, mock_gpio: Mock):
+        mock_ibs.return_value = 10
+        robot = CleaningRobot()
+        robot.initialize_robot()
+        self.assertTrue(robot.execute(robot.FORWARD).low_battery)
+
+    def test_execute_stream_yields_structured_results(self):
+        robot = CleaningRobot()
+        robot.initialize_robot()
+        self.assertEqual(list(robot.execute_stream("fr")), [CommandResult(0, 1, 'N'), CommandResult(0, 1, 'E')])
+
+    def test_obstacle_interrupts_latch_obstacle(self):
+        self.addCleanup(GPIO.reset)
+        robot = CleaningRobot()
+        robot.initialize_robot()
+        robot.enable_obstacle_interrupts()
+        GPIO.fire_edge(robot.INFRARED_PIN, GPIO.HIGH)
+        self.assertEqual(robot.execute_command(robot.FORWARD), '(0,0,N),(0,1)')
+        GPIO.fire_edge(robot.INFRARED_PIN, GPIO.LOW)
+        self.assertEqual(robot.execute_command(robot.FORWARD), '(0,1,N)')
+
+    @patch.object(GPIO, "input")
+    def test_obstacle_interrupts_do_not_read_sensor_after_moves(self, mock_input: Mock):
+        self.addCleanup(GPIO.reset)
+        mock_input.return_value = False
+        robot = CleaningRobot()
+        robot.initialize_robot()
+        robot.enable_obstacle_interrupts()
+        robot.execute_command(robot.FORWARD)
+        robot.execute_command(robot.FORWARD)
+        self.assertEqual(mock_input.call_count, 1)
+
+    def test_disable_obstacle_interrupts(self):
+        self.addCleanup(GPIO.reset)
+        robot = CleaningRobot()
+        robot.enable_obstacle_interrupts()
+        robot.disable_obstacle_interrupts()
+        self.assertNotIn(robot.INFRARED_PIN, GPIO.event_detects)
+
+    @patch("src.cleaning_robot.DEPLOYMENT", True)
+    def test_wheel_motor_stops_when_obstacle_edge_arrives(self):
+        self.addCleanup(GPIO.reset)
+        robot = CleaningRobot()
+        robot.initialize_robot()
+        robot.enable_obstacle_interrupts()
+        edge = threading.Timer(0.05, GPIO.fire_edge, (robot.INFRARED_PIN, GPIO.HIGH))
+        edge.start()
+        start = time.monotonic()
+        self.assertEqual(robot.execute_command(robot.FORWARD), '(0,0,N),(0,1)')
+        self.assertLess(time.monotonic() - start, 0.5)
+
+    @patch.object(GPIO, "output")
+    def test_continuous_drive_activates_wheel_motor_once_per_run(self, mock_gpio: Mock):
+        robot = CleaningRobot()
+        robot.initialize_robot()
+        robot.continuous_drive = True
+        self.assertEqual(list(robot.execute_commands('ffff')), ['(0,1,N)', '(0,2,N)', '(0,3,N)', '(0,4,N)'])
+        wheel_calls = [c for c in mock_gpio.call_args_list if c.args[0] == robot.WHEEL_MOTOR_PINS]
+        self.assertEqual(wheel_calls, [call(robot.WHEEL_MOTOR_PINS, (GPIO.HIGH, GPIO.LOW, GPIO.HIGH, GPIO.HIGH)),
+                                       call(robot.WHEEL_MOTOR_PINS, GPIO.LOW)])
+
+    def test_continuous_drive_stops_at_obstacle(self):
+        GPIO.script_input(CleaningRobot.INFRARED_PIN, [False, False, True])
+        self.addCleanup(GPIO.reset)
+        robot = CleaningRobot()
+        robot.initialize_robot()
+        robot.continuous_drive = True
+        with patch.object(robot, "stop_wheel_motor", wraps=robot.stop_wheel_motor) as mock_stop:
+            statuses = list(robot.execute_commands('ffffr'))
+        self.assertEqual(statuses, ['(0,1,N)', '(0,2,N)', '(0,2,N),(0,3)', '(0,2,N),(0,3)', '(0,2,E)'])
+        self.assertEqual(mock_stop.call_count, 2)
+
+    def test_continuous_drive_does_not_read_long_runs_ahead(self):
+        robot = CleaningRobot()
+        robot.initialize_robot()
+        robot.continuous_drive = True
+        robot.MAX_DRIVE_CELLS = 4
+        commands = Mock(side_effect=[robot.FORWARD] * 1000 + [None])
+        with patch.object(robot, "start_wheel_motor", wraps=robot.start_wheel_motor) as mock_start:
+            results = list(islice(robot.execute_stream(iter(commands, None)), 6))
+        self.assertEqual([(result.x, result.y) for result in results], [(0, y) for y in range(1, 7)])
+        self.assertEqual(commands.call_count, 8)
+        self.assertEqual(mock_start.call_count, 2)
+
+    @patch.object(IBS, "get_charge_left")
+    def test_continuous_drive_checks_battery_per_cell(self, mock_ibs: Mock):
+        mock_ibs.side_effect = [50, 50, 24]
+        robot = CleaningRobot()
+        robot.initialize_robot()
+        robot.continuous_drive = True
+        with patch.object(robot, "go_to_recharge_station") as mock_recharge:
+            statuses = list(robot.execute_commands('ffff'))
+        self.assertEqual(statuses, ['(0,1,N)', '(0,2,N)', '(0,2,N)'])
+        mock_recharge.assert_called_once()
+        self.assertEqual(GPIO.channel_state[robot.PWMA], GPIO.LOW)
@@ -0,0 +1,98 @@
+import threading
+from unittest import TestCase
+from unittest.mock import patch
+
+from mock import GPIO
+from mock.ibs import IBS
+from src.cleaning_robot import CleaningRobot
+from src.clock import DrainingIBS, SystemClock, VirtualClock
+
+
+class TestVirtualClock(TestCase):
+
+    def test_sleep_advances_time(self):
+        clock = VirtualClock()
+        clock.sleep(1.5)
+        self.assertEqual(clock.now(), 1.5)
+
+    def test_timers_fire_in_order(self):
+        clock = VirtualClock()
+        fired = []
+        clock.call_at(2.0, lambda: fired.append((2, clock.now())))
+        clock.call_later(1.0, lambda: fired.append((1, clock.now())))
+        clock.call_at(5.0, lambda: fired.append((5, clock.now())))
+        clock.advance(3.0)
+        self.assertEqual(fired, [(1, 1.0), (2, 2.0)])
+        self.assertEqual(clock.now(), 3.0)
+
+    def test_wait_returns_early_when_event_set_by_timer(self):
+        clock = VirtualClock()
+        event = threading.Event()
+        clock.call_later(0.25, event.set)
+        self.assertTrue(clock.wait(event, 1.0))
+        self.assertEqual(clock.now(), 0.25)
+
+    def test_wait_times_out(self):
+        clock = VirtualClock()
+        self.assertFalse(clock.wait(threading.Event(), 1.0))
+        self.assertEqual(clock.now(), 1.0)
+
+    def test_draining_ibs(self):
+        clock = VirtualClock()
+        ibs = DrainingIBS(clock, charge=50, drain_per_second=2.0)
+        clock.advance(10)
+        self.assertEqual(ibs.get_charge_left(), 30)
+        clock.advance(100)
+        self.assertEqual(ibs.get_charge_left(), 0)
+
+
+class TestCleaningRobotWithVirtualClock(TestCase):
+
+    def setUp(self):
+        setUp_mock_ibs = patch.object(IBS, "get_charge_left", return_value=25)
+        setUp_mock_ibs.start()
+        self.addCleanup(setUp_mock_ibs.stop)
+
+    def test_robot_uses_system_clock_by_default(self):
+        robot = CleaningRobot()
+        self.assertIsInstance(robot.clock, SystemClock)
+        self.assertIs(robot.battery.clock, robot.clock)
+
+    def test_motors_take_simulated_time(self):
+        clock = VirtualClock()
+        robot = CleaningRobot()
+        robot.use_clock(clock)
+        robot.initialize_robot()
+        list(robot.execute_commands('ffrf'))
+        self.assertEqual(clock.now(), 4 * robot.MOTOR_ACTIVATION_TIME)
+
+    def test_instrumentation_measures_simulated_time(self):
+        clock = VirtualClock()
+        robot = CleaningRobot()
+        robot.use_clock(clock)
+        robot.initialize_robot()
+        instrumentation = robot.enable_instrumentation()
+        robot.execute_command(robot.FORWARD)
+        self.assertEqual(instrumentation.command_latency['f'].total, robot.MOTOR_ACTIVATION_TIME)
+
+    def test_obstacle_edge_scheduled_on_clock_stops_wheel_motor(self):
+        self.addCleanup(GPIO.reset)
+        clock = VirtualClock()
+        robot = CleaningRobot()
+        robot.use_clock(clock)
+        robot.initialize_robot()
+        robot.enable_obstacle_interrupts()
+        clock.call_later(0.3, lambda: GPIO.fire_edge(robot.INFRARED_PIN, GPIO.HIGH))
+        self.assertEqual(robot.execute_command(robot.FORWARD), '(0,0,N),(0,1)')
+        self.assertEqual(clock.now(), 0.3)
+
+    def test_draining_battery_sends_robot_back(self):
+        clock = VirtualClock()
+        robot = CleaningRobot()
+        robot.use_clock(clock)
+        robot.ibs = robot.battery.ibs = DrainingIBS(clock, charge=30, drain_per_second=2.0)
+        robot.initialize_robot()
+        statuses = list(robot.execute_commands('ffffffff'))
+        self.assertEqual(len(statuses), 4)
+        self.assertTrue(robot.goingBackToRechargeStation)
+        self.assertEqual(robot.robot_status(), '(0,0,E)')
@@ -0,0 +1,99 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from mock import GPIO
+from mock.ibs import IBS
+from src.cleaning_robot import CleaningRobot
+from src.command_journal import CommandJournal, JournalReader, JournalRecord, RECORD
+
+
+class TestCommandJournal(TestCase):
+
+    def setUp(self):
+        setUp_mock_ibs = patch.object(IBS, "get_charge_left", return_value=25)
+        setUp_mock_ibs.start()
+        self.addCleanup(setUp_mock_ibs.stop)
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "journal.bin")
+
+    def read_journal(self):
+        reader = JournalReader(self.path)
+        self.addCleanup(reader.close)
+        return reader
+
+    def test_records_have_fixed_width(self):
+        with CommandJournal(self.path) as journal:
+            journal.append('f', 0, 1, 0, None, False, 80)
+            journal.append('r', -100000, 70000, 1, None, False, None)
+        self.assertEqual(os.path.getsize(self.path), 2 * RECORD.size)
+
+    def test_battery_is_rounded_and_clamped(self):
+        with CommandJournal(self.path) as journal:
+            journal.append('f', 0, 1, 0, None, False, 24.6)
+            journal.append('f', 0, 2, 0, None, False, 130)
+            journal.append('f', 0, 3, 0, None, False, -0.4)
+        self.assertEqual([record.battery for record in self.read_journal()], [25, 100, 0])
+
+    def test_commands_must_be_single_ascii_characters(self):
+        with CommandJournal(self.path) as journal:
+            for command in ('ff', '', 'é'):
+                with self.assertRaises(ValueError):
+                    journal.append(command, 0, 0, 0, None, False, 80)
+        self.assertEqual(os.path.getsize(self.path), 0)
+
+    def test_append_and_read_back(self):
+        with CommandJournal(self.path) as journal:
+            journal.append('f', 0, 0, 0, (0, 1), False, 80)
+            journal.append('l', 0, 0, 3, None, True, 9)
+        self.assertEqual(list(self.read_journal()), [JournalRecord('f', 0, 0, 'N', (0, 1), False, 80),
+                                                     JournalRecord('l', 0, 0, 'W', None, True, 9)])
+
+    def test_empty_journal(self):
+        CommandJournal(self.path).close()
+        self.assertEqual(len(self.read_journal()), 0)
+
+    def test_truncated_record_is_ignored(self):
+        with CommandJournal(self.path) as journal:
+            journal.append('f', 0, 1, 0, None, False, 80)
+        with open(self.path, 'ab') as f:
+            f.write(b'f\x00')
+        self.assertEqual(len(self.read_journal()), 1)
+
+    @patch.object(GPIO, "input")
+    def test_robot_writes_executed_commands(self, mock_input: Mock):
+        mock_input.side_effect = [False, True]
+        robot = CleaningRobot()
+        robot.initialize_robot()
+        with CommandJournal(self.path) as robot.journal:
+            robot.execute_command(robot.FORWARD)
+            robot.execute_command(robot.RIGHT)
+            robot.execute_command(robot.FORWARD)
+        self.assertEqual(list(self.read_journal()), [JournalRecord('f', 0, 1, 'N', None, False, 25),
+                                                     JournalRecord('r', 0, 1, 'E', None, False, 25),
+                                                     JournalRecord('f', 0, 1, 'E', (1, 1), False, 25)])
+
+    @patch.object(GPIO, 'output')
+    @patch.object(IBS, 'get_charge_left')
+    def test_robot_writes_commands_refused_for_low_battery(self, mock_ibs: Mock, mock_gpio: Mock):
+        mock_ibs.return_value = 10
+        robot = CleaningRobot()
+        robot.initialize_robot()
+        with CommandJournal(self.path) as robot.journal:
+            robot.execute_command(robot.FORWARD)
+        self.assertEqual(self.read_journal()[0], JournalRecord('f', 0, 0, 'N', None, True, 10))
+
+    @patch.object(GPIO, "input")
+    def test_replay_state_and_obstacles_at_any_point(self, mock_input: Mock):
+        mock_input.side_effect = [False, True, False, True]
+        robot = CleaningRobot()
+        robot.initialize_robot()
+        with CommandJournal(self.path) as robot.journal:
+            list(robot.execute_commands("ffrff"))
+        reader = self.read_journal()
+        self.assertEqual(reader.state_at(2), (0, 1, 'E'))
+        self.assertEqual(list(reader.grid_at(1).obstacles()), [(0, 2)])
+        self.assertEqual(sorted(reader.grid_at(4).obstacles()), [(0, 2), (2, 1)])
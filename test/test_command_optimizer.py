@@ -0,0 +1,51 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from mock.ibs import IBS
+from src.cleaning_robot import CleaningRobot
+from src.command_optimizer import CommandOptimizer, net_rotation
+
+
+class TestCommandOptimizer(TestCase):
+
+    def test_net_rotation(self):
+        self.assertEqual(net_rotation('lll'), 'r')
+        self.assertEqual(net_rotation('rrr'), 'l')
+        self.assertEqual(net_rotation('lr'), '')
+        self.assertEqual(net_rotation('llll'), '')
+        self.assertEqual(net_rotation('ll'), 'll')
+        self.assertEqual(net_rotation('rlrr'), 'rr')
+
+    def test_optimize_collapses_rotation_runs_only(self):
+        self.assertEqual(CommandOptimizer().optimize('flllfrlfrrf'), 'frffrrf')
+
+    def test_stats(self):
+        optimizer = CommandOptimizer()
+        optimizer.optimize('lllflr')
+        self.assertEqual((optimizer.commands_in, optimizer.commands_out, optimizer.rotations_saved), (6, 2, 4))
+
+    def test_stream_is_lazy(self):
+        stream = CommandOptimizer().stream(iter('lllf'))
+        self.assertEqual(next(stream), 'r')
+
+
+class TestCleaningRobotWithOptimizer(TestCase):
+
+    def setUp(self):
+        setUp_mock_ibs = patch.object(IBS, "get_charge_left", return_value=25)
+        setUp_mock_ibs.start()
+        self.addCleanup(setUp_mock_ibs.stop)
+
+    def test_optimized_commands_reach_the_same_status(self):
+        robot = CleaningRobot()
+        robot.initialize_robot()
+        list(robot.execute_commands('flllfrrrrf'))
+        expected = robot.robot_status()
+
+        robot = CleaningRobot()
+        robot.optimizer = CommandOptimizer()
+        robot.initialize_robot()
+        statuses = list(robot.execute_commands('flllfrrrrf'))
+        self.assertEqual(robot.robot_status(), expected)
+        self.assertEqual(len(statuses), 4)
+        self.assertEqual(robot.optimizer.rotations_saved, 6)
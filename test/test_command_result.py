@@ -0,0 +1,19 @@
+from unittest import TestCase
+
+from src.command_result import CommandResult
+
+
+class TestCommandResult(TestCase):
+
+    def test_str_of_move(self):
+        self.assertEqual(str(CommandResult(1, 2, 'N')), '(1,2,N)')
+
+    def test_str_with_obstacle(self):
+        self.assertEqual(str(CommandResult(1, 2, 'N', obstacle=(1, 3))), '(1,2,N),(1,3)')
+
+    def test_str_with_low_battery(self):
+        self.assertEqual(str(CommandResult(1, 2, 'N', low_battery=True)), '!(1,2,N)')
+
+    def test_equality(self):
+        self.assertEqual(CommandResult(0, 1, 'E', (1, 1)), CommandResult(0, 1, 'E', (1, 1)))
+        self.assertNotEqual(CommandResult(0, 1, 'E'), CommandResult(0, 1, 'E', low_battery=True))
@@ -0,0 +1,58 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.coverage_planner import plan_coverage, reachable_cells, rotations, ROWS, COLUMNS
+from src.occupancy_grid import OccupancyGrid
+from src.route_planner import apply_command, plan_route
+
+
+def visited_cells(commands, start=(0, 0, 'N')):
+    state = start
+    cells = {start[:2]}
+    for command in commands:
+        state = apply_command(state, command)
+        cells.add(state[:2])
+    return cells
+
+
+class TestCoveragePlanner(TestCase):
+
+    def test_plan_coverage_along_columns(self):
+        self.assertEqual(plan_coverage(2, 3, sweep=COLUMNS), 'ffrfrff')
+
+    def test_plan_coverage_along_rows(self):
+        self.assertEqual(plan_coverage(3, 2, sweep=ROWS), 'rfflflff')
+
+    def test_plan_coverage_picks_sweep_with_fewer_rotations(self):
+        self.assertEqual(rotations(plan_coverage(2, 5)), 2)
+
+    def test_plan_coverage_visits_every_free_cell(self):
+        grid = OccupancyGrid()
+        grid.mark_obstacle(1, 2)
+        grid.mark_obstacle(3, 1)
+        route = plan_coverage(5, 4, grid)
+        all_cells = {(x, y) for x in range(5) for y in range(4)}
+        self.assertEqual(visited_cells(route), all_cells - {(1, 2), (3, 1)})
+
+    def test_plan_coverage_skips_unreachable_cells(self):
+        grid = OccupancyGrid()
+        grid.mark_obstacle(1, 2)
+        grid.mark_obstacle(2, 1)
+        route = plan_coverage(3, 3, grid)
+        self.assertNotIn((2, 2), visited_cells(route))
+
+    def test_plan_coverage_with_walled_off_region_searches_reachable_cells_only(self):
+        grid = OccupancyGrid()
+        for y in range(40):
+            grid.mark_obstacle(20, y)
+        with patch("src.coverage_planner.plan_route", wraps=plan_route) as mock_plan_route:
+            route = plan_coverage(40, 40, grid)
+        self.assertEqual(visited_cells(route), {(x, y) for x in range(20) for y in range(40)})
+        # Only the reachable cells are searched, once per sweep
+        self.assertEqual(mock_plan_route.call_count, 2 * (20 * 40 - 1))
+
+    def test_reachable_cells(self):
+        grid = OccupancyGrid()
+        grid.mark_obstacle(1, 0)
+        grid.mark_obstacle(1, 1)
+        self.assertEqual(reachable_cells((0, 0), grid.is_obstacle, (0, 0, 2, 1)), {(0, 0), (0, 1)})
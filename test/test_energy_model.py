@@ -0,0 +1,69 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from mock.ibs import IBS
+from src.cleaning_robot import CleaningRobot, CleaningRobotError
+from src.command_journal import JournalRecord
+from src.energy_model import EnergyModel, EnergySample, samples_from_journal
+
+
+class TestEnergyModel(TestCase):
+
+    def test_cost(self):
+        model = EnergyModel(forward=1.0, rotation=0.5, cleaning=0.25)
+        self.assertEqual(model.cost('ffl'), 3.25)
+        self.assertEqual(model.cost('ffl', cleaning=False), 2.5)
+
+    def test_fit_recovers_costs(self):
+        samples = [EnergySample(f, r, c, f * 1.0 + r * 0.5 + c * 0.25)
+                   for f, r, c in [(4, 0, 4), (0, 4, 0), (2, 2, 0), (3, 1, 4), (5, 0, 0)]]
+        model = EnergyModel.fit(samples)
+        for expected, actual in zip((1.0, 0.5, 0.25), model):
+            self.assertAlmostEqual(expected, actual, places=4)
+
+    def test_fit_with_cleaning_always_on_predicts_costs(self):
+        samples = [EnergySample(f, r, f + r, f * 1.25 + r * 0.75) for f, r in [(4, 0), (0, 4), (2, 2), (3, 1)]]
+        self.assertAlmostEqual(EnergyModel.fit(samples).cost('fffl'), 4.5, places=4)
+
+    def test_fit_without_samples(self):
+        self.assertRaises(ValueError, EnergyModel.fit, [])
+
+    def test_samples_from_journal(self):
+        records = [JournalRecord(command, 0, 0, 'N', None, False, battery)
+                   for command, battery in [('f', 50), ('f', 50), ('l', 50), ('f', 48), ('f', 47), ('f', 90)]]
+        self.assertEqual(samples_from_journal(records),
+                         [EnergySample(2, 1, 3, 2), EnergySample(1, 0, 1, 1)])
+
+
+class TestRouteAdmission(TestCase):
+
+    def setUp(self):
+        setUp_mock_ibs = patch.object(IBS, "get_charge_left", return_value=40)
+        setUp_mock_ibs.start()
+        self.addCleanup(setUp_mock_ibs.stop)
+        self.robot = CleaningRobot()
+        self.robot.initialize_robot()
+        self.robot.energy_model = EnergyModel(forward=1.0, rotation=0.5)
+
+    def test_route_energy_includes_return_trip(self):
+        # ffrf ends in (1,2,E): the way back (e.g., rrflffl) takes 3 forwards and 4 rotations
+        self.assertEqual(self.robot.route_energy('ffrf'), 3.5 + 5.0)
+
+    def test_route_energy_stops_in_front_of_known_obstacles(self):
+        self.robot.grid.mark_obstacle(0, 2)
+        self.assertEqual(self.robot.route_energy('ff'), 2.0 + 2.5)
+
+    def test_route_fits(self):
+        self.assertTrue(self.robot.route_fits('ffrf'))
+
+    def test_route_triggering_recharge_does_not_fit(self):
+        self.assertFalse(self.robot.route_fits('f' * 16))
+
+    def test_route_without_return_trip_energy_does_not_fit(self):
+        self.robot.energy_model = EnergyModel(forward=2.0, rotation=1.0)
+        # 14 for the route leaves 26 > 24, but going back from (0,7) costs 17 more
+        self.assertFalse(self.robot.route_fits('f' * 7))
+
+    def test_route_energy_without_model(self):
+        self.robot.energy_model = None
+        self.assertRaises(CleaningRobotError, self.robot.route_energy, 'f')
@@ -0,0 +1,68 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from mock.ibs import IBS
+from src.cleaning_robot import CleaningRobot, CleaningRobotError
+from src.fleet_simulator import FleetSimulator
+from src.occupancy_grid import OccupancyGrid
+from src.scenario_runner import Scenario, SimulatedRobot
+
+
+class TestFleetSimulator(TestCase):
+
+    @patch.object(IBS, "get_charge_left", return_value=25)
+    def test_run_matches_cleaning_robot(self, mock_ibs):
+        routes = ["ffrff", "lfflf", "rrfrf"]
+        fleet = FleetSimulator(len(routes))
+        fleet.run(routes)
+        for i, route in enumerate(routes):
+            robot = CleaningRobot()
+            robot.initialize_robot()
+            for command in route:
+                robot.execute_command(command)
+            self.assertEqual(fleet.status(i), robot.robot_status())
+
+    def test_obstacle_hit_leaves_robot_in_place(self):
+        grid = OccupancyGrid()
+        grid.mark_obstacle(0, 2)
+        fleet = FleetSimulator(1, grid)
+        fleet.run(["fff"])
+        self.assertEqual(fleet.status(0), '(0,1,N)')
+        self.assertEqual(fleet.obstacle_hits[0], 2)
+
+    def test_robot_with_low_battery_stays_still(self):
+        fleet = FleetSimulator(2, charge=10)
+        fleet.run(["ff", "rf"])
+        self.assertEqual([fleet.status(0), fleet.status(1)], ['(0,0,N)', '(0,0,N)'])
+        self.assertEqual(list(fleet.low_battery), [1, 1])
+
+    def test_robot_goes_back_to_recharge_station_below_25(self):
+        fleet = FleetSimulator(1, charge=26, forward_drain=1)
+        fleet.run(["fffff"])
+        self.assertEqual(fleet.status(0), '(2,0,E)')
+        self.assertEqual(fleet.going_back[0], 1)
+        self.assertEqual(fleet.charge[0], 20)
+
+    def test_robot_that_cannot_go_back_is_flagged(self):
+        grid = OccupancyGrid()
+        for x, y in [(-1, 2), (1, 2), (0, 3), (0, 1)]:
+            grid.mark_obstacle(x, y)
+        fleet = FleetSimulator(1, grid, charge=24)
+        fleet.x[0] = 0
+        fleet.y[0] = 2
+        fleet.run(["f"])
+        self.assertEqual(fleet.error[0], 1)
+
+    def test_battery_running_out_on_the_way_back_matches_cleaning_robot(self):
+        scenario = Scenario(0, 1, 5, frozenset(), 26.0, 5.0, 5.0)
+        robot = SimulatedRobot(scenario)
+        robot.initialize_robot()
+        with self.assertRaises(CleaningRobotError):
+            for command in "ffff":
+                robot.execute(command)
+
+        fleet = FleetSimulator(1, charge=26, forward_drain=5, rotation_drain=5)
+        fleet.run(["ffff"])
+        self.assertEqual(fleet.error[0], 1)
+        self.assertEqual(fleet.status(0), robot.robot_status())
+        self.assertEqual(fleet.charge[0], robot.ibs.charge)
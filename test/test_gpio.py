@@ -0,0 +1,103 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from mock import GPIO
+
+
+class TestGPIO(TestCase):
+
+    def setUp(self):
+        GPIO.reset()
+        self.addCleanup(GPIO.reset)
+
+    def test_output_single_channel(self):
+        GPIO.output(12, GPIO.HIGH)
+        self.assertEqual(GPIO.channel_state[12], GPIO.HIGH)
+
+    def test_output_list_of_channels_with_one_value(self):
+        GPIO.output([16, 18], GPIO.HIGH)
+        GPIO.output((16, 18), GPIO.LOW)
+        self.assertEqual((GPIO.channel_state[16], GPIO.channel_state[18]), (GPIO.LOW, GPIO.LOW))
+
+    def test_output_list_of_channels_with_matching_values(self):
+        GPIO.output((29, 31, 32), (GPIO.HIGH, GPIO.LOW, GPIO.HIGH))
+        self.assertEqual([GPIO.channel_state[pin] for pin in (29, 31, 32)], [GPIO.HIGH, GPIO.LOW, GPIO.HIGH])
+
+    def test_output_list_of_channels_with_wrong_number_of_values(self):
+        self.assertRaises(RuntimeError, GPIO.output, (29, 31), (GPIO.HIGH,))
+
+    def test_input_of_unset_channel_is_low(self):
+        self.assertEqual(GPIO.input(15), GPIO.LOW)
+
+    def test_input_returns_simulated_level(self):
+        GPIO.set_input(15, GPIO.HIGH)
+        self.assertEqual([GPIO.input(15), GPIO.input(15)], [GPIO.HIGH, GPIO.HIGH])
+
+    def test_input_returns_scripted_values_then_keeps_the_last_one(self):
+        GPIO.script_input(15, [GPIO.LOW, GPIO.HIGH])
+        self.assertEqual([GPIO.input(15) for _ in range(3)], [GPIO.LOW, GPIO.HIGH, GPIO.HIGH])
+
+    def test_set_input_overrides_script(self):
+        GPIO.script_input(15, [GPIO.HIGH])
+        GPIO.set_input(15, GPIO.LOW)
+        self.assertEqual(GPIO.input(15), GPIO.LOW)
+
+    def test_input_reads_back_output_state(self):
+        GPIO.output(13, GPIO.HIGH)
+        self.assertEqual(GPIO.input(13), GPIO.HIGH)
+
+    def test_reset(self):
+        GPIO.output(12, GPIO.HIGH)
+        GPIO.script_input(15, [GPIO.HIGH])
+        GPIO.reset()
+        self.assertEqual((GPIO.input(12), GPIO.input(15)), (GPIO.LOW, GPIO.LOW))
+
+    def test_log_messages_are_not_formatted_when_disabled(self):
+        flag = MagicMock()
+        GPIO.setwarnings(flag)
+        flag.__str__.assert_not_called()
+
+    def test_fire_edge_calls_callbacks(self):
+        fired = []
+        GPIO.add_event_detect(15, GPIO.BOTH, callback=fired.append)
+        GPIO.fire_edge(15, GPIO.HIGH)
+        GPIO.fire_edge(15, GPIO.LOW)
+        self.assertEqual(fired, [15, 15])
+
+    def test_fire_edge_only_on_matching_edge(self):
+        fired = []
+        GPIO.add_event_detect(15, GPIO.RISING)
+        GPIO.add_event_callback(15, fired.append)
+        GPIO.fire_edge(15, GPIO.HIGH)
+        GPIO.fire_edge(15, GPIO.HIGH)
+        GPIO.fire_edge(15, GPIO.LOW)
+        self.assertEqual(fired, [15])
+
+    def test_event_detected_is_cleared_once_read(self):
+        GPIO.add_event_detect(15, GPIO.FALLING)
+        GPIO.set_input(15, GPIO.HIGH)
+        GPIO.fire_edge(15, GPIO.LOW)
+        self.assertEqual([GPIO.event_detected(15), GPIO.event_detected(15)], [True, False])
+
+    def test_remove_event_detect(self):
+        fired = []
+        GPIO.add_event_detect(15, GPIO.BOTH, callback=fired.append)
+        GPIO.remove_event_detect(15)
+        GPIO.fire_edge(15, GPIO.HIGH)
+        self.assertEqual(fired, [])
+
+    def test_conflicting_event_detect(self):
+        GPIO.add_event_detect(15, GPIO.BOTH)
+        self.assertRaises(RuntimeError, GPIO.add_event_detect, 15, GPIO.RISING)
+
+    def test_pwm_records_duty_cycle_timeline(self):
+        pwm = GPIO.PWM(16, 1000)
+        pwm.timer = iter(range(10)).__next__
+        pwm.start(0)
+        pwm.ChangeDutyCycle(50)
+        pwm.stop()
+        self.assertEqual(pwm.timeline, [(0, 0), (1, 50), (2, 0)])
+        self.assertEqual(pwm.dutycycles(), [0, 50, 0])
+
+    def test_pwm_rejects_invalid_duty_cycle(self):
+        self.assertRaises(ValueError, GPIO.PWM(16, 1000).ChangeDutyCycle, 120)
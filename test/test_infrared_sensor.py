@@ -0,0 +1,119 @@
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from mock import GPIO
+from mock.ibs import IBS
+from src.cleaning_robot import CleaningRobot
+from src.clock import VirtualClock
+from src.infrared_sensor import InfraredSensor
+
+
+class TestInfraredSensor(TestCase):
+
+    def test_single_sample_by_default(self):
+        read = Mock(return_value=1)
+        self.assertTrue(InfraredSensor().obstacle_found(read, (0, 1)))
+        read.assert_called_once_with()
+
+    def test_majority_of_samples(self):
+        sensor = InfraredSensor(samples=5)
+        self.assertFalse(sensor.obstacle_found(Mock(side_effect=[1, 0, 1, 0, 0]), (0, 1)))
+        self.assertTrue(sensor.obstacle_found(Mock(side_effect=[1, 0, 1, 1]), (0, 1)))
+
+    def test_sampling_stops_once_decided(self):
+        sensor = InfraredSensor(samples=5)
+        read = Mock(return_value=0)
+        sensor.obstacle_found(read, (0, 1))
+        self.assertEqual(read.call_count, 3)
+        self.assertEqual(sensor.reads, 3)
+
+    def test_custom_threshold(self):
+        sensor = InfraredSensor(samples=3, threshold=3)
+        self.assertFalse(sensor.obstacle_found(Mock(side_effect=[1, 1, 0]), (0, 1)))
+
+    def test_invalid_configuration(self):
+        self.assertRaises(ValueError, InfraredSensor, samples=0)
+        self.assertRaises(ValueError, InfraredSensor, samples=3, threshold=4)
+
+    def test_samples_are_spaced(self):
+        clock = VirtualClock()
+        InfraredSensor(samples=3, sample_interval=0.01, clock=clock).obstacle_found(Mock(side_effect=[1, 0, 1]), (0, 1))
+        self.assertAlmostEqual(clock.now(), 0.02)
+
+    def test_clear_cells_are_cached(self):
+        clock = VirtualClock()
+        sensor = InfraredSensor(samples=3, clear_ttl=0.5, clock=clock)
+        read = Mock(return_value=0)
+        sensor.obstacle_found(read, (0, 1))
+        self.assertFalse(sensor.obstacle_found(read, (0, 1)))
+        self.assertEqual((read.call_count, sensor.cache_hits), (2, 1))
+        self.assertEqual(sensor.cell_confidence((0, 1)), 0.0)
+        clock.advance(0.5)
+        sensor.obstacle_found(read, (0, 1))
+        self.assertEqual(read.call_count, 4)
+
+    def test_uncertain_cells_are_read_again(self):
+        sensor = InfraredSensor(samples=3, clear_ttl=10, clock=VirtualClock())
+        read = Mock(side_effect=[1, 0, 0, 0, 0])
+        sensor.obstacle_found(read, (0, 1))
+        self.assertAlmostEqual(sensor.cell_confidence((0, 1)), 1 / 3)
+        sensor.obstacle_found(read, (0, 1))
+        self.assertEqual(read.call_count, 5)
+
+    def test_invalidate(self):
+        sensor = InfraredSensor(clear_ttl=10, clock=VirtualClock())
+        sensor.obstacle_found(Mock(return_value=0), (0, 1))
+        sensor.invalidate((0, 1))
+        self.assertIsNone(sensor.cell_confidence((0, 1)))
+
+    def test_fresh_reading_bypasses_the_cache(self):
+        sensor = InfraredSensor(clear_ttl=60, clock=VirtualClock())
+        read = Mock(side_effect=[0, 1])
+        sensor.obstacle_found(read, (0, 1))
+        self.assertTrue(sensor.obstacle_found(read, (0, 1), fresh=True))
+        self.assertEqual(sensor.cell_confidence((0, 1)), 1.0)
+
+
+class TestCleaningRobotInfraredSensor(TestCase):
+
+    def setUp(self):
+        setUp_mock_ibs = patch.object(IBS, "get_charge_left", return_value=25)
+        setUp_mock_ibs.start()
+        self.addCleanup(setUp_mock_ibs.stop)
+
+    def test_noisy_read_is_not_an_obstacle(self):
+        GPIO.script_input(CleaningRobot.INFRARED_PIN, [True, False, False])
+        self.addCleanup(GPIO.reset)
+        robot = CleaningRobot()
+        robot.infrared = InfraredSensor(samples=3)
+        robot.initialize_robot()
+        self.assertEqual(robot.execute_command(robot.FORWARD), '(0,1,N)')
+        self.assertFalse(robot.is_known_obstacle(0, 1))
+
+    @patch.object(GPIO, "input", return_value=False)
+    def test_sensor_faces_the_cell_ahead(self, mock_input: Mock):
+        robot = CleaningRobot()
+        robot.infrared = InfraredSensor(clear_ttl=60, clock=robot.clock)
+        robot.initialize_robot()
+        robot.execute_command(robot.FORWARD)
+        self.assertEqual(robot.infrared.cell_confidence((0, 1)), 0.0)
+
+    @patch.object(GPIO, "input")
+    def test_obstacle_appearing_in_a_cell_found_clear_stops_the_robot(self, mock_input: Mock):
+        mock_input.return_value = False
+        robot = CleaningRobot()
+        robot.infrared = InfraredSensor(clear_ttl=60)
+        robot.initialize_robot()
+        self.assertFalse(robot.obstacle_found())
+        mock_input.return_value = True
+        self.assertEqual(robot.execute_command(robot.FORWARD), '(0,0,N),(0,1)')
+
+    def test_sensor_assigned_after_use_clock_follows_the_robot_clock(self):
+        robot = CleaningRobot()
+        clock = VirtualClock()
+        robot.use_clock(clock)
+        robot.infrared = InfraredSensor(samples=2, threshold=1, sample_interval=0.5)
+        self.assertIs(robot.infrared.clock, clock)
+        robot.initialize_robot()
+        robot.obstacle_found()
+        self.assertEqual(clock.now(), 0.5)
@@ -0,0 +1,87 @@
+from itertools import count
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from mock import GPIO
+from mock.ibs import IBS
+from src.cleaning_robot import CleaningRobot
+from src.clock import VirtualClock
+from src.instrumentation import Instrumentation, LatencyHistogram
+
+
+class TestInstrumentation(TestCase):
+
+    def setUp(self):
+        setUp_mock_ibs = patch.object(IBS, "get_charge_left", return_value=25)
+        setUp_mock_ibs.start()
+        self.addCleanup(setUp_mock_ibs.stop)
+
+    def test_histogram_buckets(self):
+        histogram = LatencyHistogram()
+        histogram.record(0.5e-6)
+        histogram.record(3e-6)
+        histogram.record(3.5e-6)
+        self.assertEqual(histogram.snapshot()["buckets"], {1e-6: 1, 4e-6: 2})
+
+    def test_latency_recorded_by_command_type(self):
+        robot = CleaningRobot()
+        robot.initialize_robot()
+        instrumentation = robot.enable_instrumentation()
+        for command in "fflr":
+            robot.execute_command(command)
+        snapshot = instrumentation.snapshot()
+        self.assertEqual({command: latency["count"] for command, latency in snapshot["command_latency"].items()},
+                         {'f': 2, 'l': 1, 'r': 1})
+
+    def test_continuous_drive_latency_is_recorded(self):
+        robot = CleaningRobot()
+        robot.use_clock(VirtualClock())
+        robot.initialize_robot()
+        robot.continuous_drive = True
+        instrumentation = robot.enable_instrumentation()
+        list(robot.execute_commands("fff"))
+        latency = instrumentation.snapshot()["command_latency"]["f"]
+        self.assertEqual((latency["count"], latency["total"]), (3, 3 * robot.MOTOR_ACTIVATION_TIME))
+
+    def test_hardware_calls_are_counted(self):
+        robot = CleaningRobot()
+        robot.initialize_robot()
+        instrumentation = robot.enable_instrumentation()
+        robot.execute_command(robot.FORWARD)
+        snapshot = instrumentation.snapshot()
+        self.assertEqual((snapshot["gpio_outputs"], snapshot["gpio_inputs"], snapshot["ibs_reads"]), (2, 1, 1))
+
+    @patch.object(GPIO, "output")
+    def test_instrumented_gpio_calls_still_reach_the_backend(self, mock_gpio: Mock):
+        robot = CleaningRobot()
+        robot.enable_instrumentation()
+        robot.manage_cleaning_system()
+        self.assertEqual(mock_gpio.call_count, 2)
+
+    def test_time_spent_going_to_recharge_station(self):
+        robot = CleaningRobot()
+        robot.initialize_robot()
+        robot.pos_x = 1
+        instrumentation = robot.enable_instrumentation(Instrumentation(timer=count().__next__))
+        robot.go_to_recharge_station()
+        self.assertEqual(instrumentation.recharge_trips, 1)
+        # Two ticks for each of the 4 commands timed on the way back (e.g. "lfll"), plus one to end the trip
+        self.assertEqual(instrumentation.recharge_time, 9)
+
+    def test_exporters_receive_snapshot(self):
+        exported = []
+        robot = CleaningRobot()
+        instrumentation = robot.enable_instrumentation()
+        instrumentation.add_exporter(exported.append)
+        robot.manage_cleaning_system()
+        instrumentation.export()
+        self.assertEqual(exported[0]["gpio_outputs"], 2)
+
+    def test_disable_instrumentation(self):
+        robot = CleaningRobot()
+        robot.initialize_robot()
+        instrumentation = robot.enable_instrumentation()
+        robot.disable_instrumentation()
+        robot.execute_command(robot.FORWARD)
+        self.assertEqual(instrumentation.snapshot()["command_latency"], {})
+        self.assertNotIn("perform_command", vars(robot))
@@ -0,0 +1,50 @@
+from unittest import TestCase
+
+from src.occupancy_grid import OccupancyGrid
+
+
+class TestOccupancyGrid(TestCase):
+
+    def test_unmarked_cell_has_no_flags(self):
+        grid = OccupancyGrid()
+        self.assertEqual(grid.get(3, 3), 0)
+
+    def test_mark_obstacle(self):
+        grid = OccupancyGrid()
+        grid.mark_obstacle(2, 1)
+        self.assertTrue(grid.is_obstacle(2, 1))
+
+    def test_mark_free_clears_obstacle(self):
+        grid = OccupancyGrid()
+        grid.mark_obstacle(2, 1)
+        grid.mark_free(2, 1, cleaned=True)
+        self.assertEqual(grid.get(2, 1), OccupancyGrid.VISITED | OccupancyGrid.CLEANED)
+
+    def test_grid_grows_to_include_far_and_negative_cells(self):
+        grid = OccupancyGrid(width=4, height=4)
+        grid.mark_obstacle(1, 1)
+        grid.mark_obstacle(-3, 10)
+        grid.mark_free(20, -2)
+        self.assertTrue(grid.is_obstacle(1, 1))
+        self.assertTrue(grid.is_obstacle(-3, 10))
+        self.assertEqual(grid.get(20, -2), OccupancyGrid.VISITED)
+
+    def test_marked_area(self):
+        grid = OccupancyGrid()
+        grid.mark_free(0, 0)
+        grid.mark_obstacle(-1, 5)
+        self.assertEqual(grid.marked_area(), (-1, 0, 0, 5))
+
+    def test_obstacles(self):
+        grid = OccupancyGrid()
+        grid.mark_obstacle(0, 1)
+        grid.mark_free(1, 1)
+        grid.mark_obstacle(-2, 0)
+        self.assertEqual(sorted(grid.obstacles()), [(-2, 0), (0, 1)])
+
+    def test_uncleaned_cells_in_region(self):
+        grid = OccupancyGrid()
+        grid.mark_free(0, 0, cleaned=True)
+        grid.mark_obstacle(1, 0)
+        grid.mark_free(0, 1)
+        self.assertEqual(grid.uncleaned_cells(0, 0, 1, 1), [(0, 1), (1, 1)])
@@ -0,0 +1,80 @@
+import asyncio
+import os
+import tempfile
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+
+from mock.ibs import IBS
+from src.async_cleaning_robot import AsyncCleaningRobot
+from src.rms_server import RMSClient, RMSServer
+
+
+class TestRMSServer(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        setUp_mock_ibs = patch.object(IBS, "get_charge_left", return_value=25)
+        setUp_mock_ibs.start()
+        self.addCleanup(setUp_mock_ibs.stop)
+        self.robot = AsyncCleaningRobot()
+        self.robot.initialize_robot()
+        self.server = RMSServer(self.robot)
+        self.listener = await self.server.start()
+        self.port = self.listener.sockets[0].getsockname()[1]
+        self.client = await RMSClient.connect(port=self.port)
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        self.listener.close()
+        await self.listener.wait_closed()
+
+    async def test_execute_batch(self):
+        self.assertEqual(await self.client.execute('frf'), ['(0,1,N)', '(0,1,E)', '(1,1,E)'])
+
+    async def test_status(self):
+        await self.client.execute('ff')
+        self.assertEqual(await self.client.status(), '(0,2,N)')
+
+    async def test_pipelined_requests_are_answered_in_order(self):
+        for request in ('f', 'r', '?', 'f'):
+            await self.client.send(request)
+        answers = [await self.client.receive() for _ in range(4)]
+        self.assertEqual(answers, [['(0,1,N)'], ['(0,1,E)'], ['(0,1,E)'], ['(1,1,E)']])
+
+    async def test_invalid_request(self):
+        answer = await self.client.execute('fx')
+        self.assertTrue(answer[0].startswith('ERROR'))
+        self.assertEqual(await self.client.status(), '(0,0,N)')
+
+    @patch.object(IBS, "get_charge_left", return_value=5)
+    async def test_batch_stops_with_low_battery(self, mock_ibs):
+        self.assertEqual(await self.client.execute('fff'), ['!(0,0,N)'])
+
+    @patch("src.cleaning_robot.DEPLOYMENT", True)
+    async def test_status_query_while_motors_run(self):
+        self.robot.MOTOR_ACTIVATION_TIME = 0.05
+        self.robot.OBSTACLE_POLL_INTERVAL = 0.01
+        await self.client.send('ffff')
+        await asyncio.sleep(0.07)
+        observer = await RMSClient.connect(port=self.port)
+        self.addAsyncCleanup(observer.close)
+        self.assertIn(await observer.status(), ('(0,0,N)', '(0,1,N)', '(0,2,N)', '(0,3,N)'))
+        self.assertEqual((await self.client.receive())[-1], '(0,4,N)')
+
+    @patch.object(IBS, "get_charge_left", return_value=24)
+    async def test_batch_without_route_home_answers_error_and_keeps_connection(self, mock_ibs):
+        for x, y in [(-1, 2), (1, 2), (0, 3), (0, 1)]:
+            self.robot.grid.mark_obstacle(x, y)
+        self.robot.pos_y = 2
+        answer = await self.client.execute('f')
+        self.assertEqual(answer, ['ERROR no route to the recharge station'])
+        self.assertEqual(await self.client.status(), '(0,2,N)')
+
+    async def test_unix_socket(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'rms.sock')
+            listener = await RMSServer(self.robot).start(path)
+            client = await RMSClient.connect(path)
+            self.assertEqual(await client.execute('l'), ['(0,0,W)'])
+            await client.close()
+            listener.close()
+            await listener.wait_closed()
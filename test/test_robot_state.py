@@ -0,0 +1,19 @@
+from unittest import TestCase
+
+from src.robot_state import RobotState, HEADINGS, HEADING_CODES, TURN_LEFT, TURN_RIGHT
+
+
+class TestRobotState(TestCase):
+
+    def test_turn_tables_are_inverse(self):
+        for heading in range(len(HEADINGS)):
+            self.assertEqual(TURN_LEFT[TURN_RIGHT[heading]], heading)
+
+    def test_turn_right_goes_clockwise(self):
+        self.assertEqual([HEADINGS[TURN_RIGHT[HEADING_CODES[h]]] for h in 'NESW'], ['E', 'S', 'W', 'N'])
+
+    def test_state_has_no_dict(self):
+        self.assertFalse(hasattr(RobotState(), '__dict__'))
+
+    def test_repr(self):
+        self.assertEqual(repr(RobotState(1, 2, HEADING_CODES['W'])), 'RobotState(1,2,W)')
@@ -0,0 +1,31 @@
+from unittest import TestCase
+
+from src.route_planner import plan_route
+
+
+class TestRoutePlanner(TestCase):
+
+    def setUp(self):
+        self.bounds = (-1, -1, 4, 4)
+
+    def test_plan_route_straight_ahead(self):
+        self.assertEqual(plan_route((0, 3, 'S'), (0, 0), lambda x, y: False, self.bounds), 'fff')
+
+    def test_plan_route_prefers_fewer_rotations(self):
+        route = plan_route((2, 2, 'W'), (0, 0), lambda x, y: False, self.bounds)
+        self.assertEqual(len(route), 5)
+        self.assertEqual(route.count('l') + route.count('r'), 1)
+
+    def test_plan_route_turns_to_goal_heading(self):
+        route = plan_route((1, 0, 'W'), (0, 0), lambda x, y: False, self.bounds, goal_heading='E')
+        self.assertIn(route, ('fll', 'frr'))
+
+    def test_plan_route_around_obstacle(self):
+        obstacles = {(0, 1)}
+        route = plan_route((0, 2, 'S'), (0, 0), lambda x, y: (x, y) in obstacles, self.bounds)
+        self.assertEqual(len(route), 7)
+        self.assertNotEqual(route[0], 'f')
+
+    def test_plan_route_unreachable_goal(self):
+        obstacles = {(1, 0), (0, 1)}
+        self.assertIsNone(plan_route((2, 2, 'S'), (0, 0), lambda x, y: (x, y) in obstacles, (0, 0, 3, 3)))
@@ -0,0 +1,38 @@
+from unittest import TestCase
+
+from src.scenario_runner import Scenario, ScenarioStats, Outcome, random_scenarios, run_scenario, run_scenarios
+
+
+class TestScenarioRunner(TestCase):
+
+    def test_run_scenario_completes_with_enough_charge(self):
+        scenario = Scenario(0, 3, 3, frozenset(), 100.0, 1.0, 1.0)
+        self.assertEqual(run_scenario(scenario), Outcome(True, False, False, None))
+
+    def test_run_scenario_goes_back_to_recharge_station(self):
+        scenario = Scenario(0, 3, 3, frozenset(), 27.0, 0.5, 0.5)
+        self.assertEqual(run_scenario(scenario), Outcome(False, True, False, None))
+
+    def test_run_scenario_error_when_battery_runs_out_going_back(self):
+        scenario = Scenario(0, 1, 5, frozenset(), 26.0, 5.0, 5.0)
+        self.assertEqual(run_scenario(scenario), Outcome(False, True, True, None))
+
+    def test_run_scenario_counts_commands_before_low_battery(self):
+        scenario = Scenario(0, 4, 4, frozenset(), 30.0, 1.0, 1.0)
+        self.assertEqual(run_scenario(scenario), Outcome(False, True, False, 14))
+
+    def test_stats_merge(self):
+        stats = ScenarioStats()
+        stats.add(Outcome(True, False, False, None))
+        other = ScenarioStats()
+        other.add(Outcome(False, True, True, None))
+        other.add(Outcome(False, False, False, 4))
+        stats.merge(other)
+        self.assertEqual((stats.completion_rate(), stats.error_rate()), (1 / 3, 1 / 3))
+        self.assertEqual(stats.mean_commands_before_low_battery(), 4)
+
+    def test_run_scenarios_in_process_pool(self):
+        pooled = run_scenarios(random_scenarios(40, initial_charge=40), processes=2, chunksize=4, batch_size=16)
+        inline = run_scenarios(random_scenarios(40, initial_charge=40), processes=1)
+        self.assertEqual(pooled.runs, 40)
+        self.assertEqual(vars(pooled), vars(inline))
@@ -0,0 +1,61 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from mock.ibs import IBS
+from src.cleaning_robot import CleaningRobot
+from src.clock import VirtualClock
+from src.speed_profile import SpeedProfile, linear_ramp
+
+
+class TestSpeedProfile(TestCase):
+
+    def test_linear_ramp(self):
+        self.assertEqual(linear_ramp(0, 60, 2), (20.0, 40.0))
+
+    def test_boost_while_enough_cells_left(self):
+        profile = SpeedProfile(cruise=60, boost=90, boost_after=3)
+        self.assertEqual([profile.speed(cells_left) for cells_left in (4, 3, 2, 1)], [90, 90, 60, 60])
+
+    def test_without_boost_always_cruise(self):
+        self.assertEqual(SpeedProfile(cruise=60).speed(10), 60)
+
+    def test_cell_time_scales_with_speed(self):
+        self.assertEqual(SpeedProfile(cruise=60).cell_time(90, 1.5), 1.0)
+
+
+class TestCleaningRobotSpeedControl(TestCase):
+
+    def setUp(self):
+        setUp_mock_ibs = patch.object(IBS, "get_charge_left", return_value=25)
+        setUp_mock_ibs.start()
+        self.addCleanup(setUp_mock_ibs.stop)
+        self.clock = VirtualClock()
+        self.robot = CleaningRobot()
+        self.robot.use_clock(self.clock)
+        self.robot.initialize_robot()
+
+    def test_forward_ramps_up_and_down(self):
+        self.robot.enable_speed_control(SpeedProfile(cruise=60, ramp_up=(20, 40), ramp_down=(30,), step_time=0.1))
+        self.robot.wheel_pwm.timer = self.clock.now
+        self.assertEqual(self.robot.execute_command(self.robot.FORWARD), '(0,1,N)')
+        self.assertEqual(self.robot.wheel_pwm.timeline[1:], [(0.0, 20), (0.1, 40), (0.2, 60), (1.2, 30), (1.3, 0)])
+
+    def test_rotation_ramps_up_and_down(self):
+        self.robot.enable_speed_control(rotation_profile=SpeedProfile(cruise=80, ramp_up=(40,), ramp_down=(40,)))
+        self.robot.execute_command(self.robot.RIGHT)
+        self.assertEqual(self.robot.rotation_pwm.dutycycles(), [0, 40, 80, 40, 0])
+        self.assertEqual(self.robot.wheel_pwm.dutycycles(), [0])
+
+    def test_long_straight_run_is_boosted(self):
+        self.robot.enable_speed_control(SpeedProfile(cruise=50, boost=100, boost_after=2))
+        self.robot.continuous_drive = True
+        self.assertEqual(list(self.robot.execute_commands('ffff')), ['(0,1,N)', '(0,2,N)', '(0,3,N)', '(0,4,N)'])
+        self.assertEqual(self.robot.wheel_pwm.dutycycles(), [0, 50, 100, 50, 0])
+        self.assertEqual(self.clock.now(), 0.5 * 3 + 1.0)
+
+    def test_disable_speed_control(self):
+        self.robot.enable_speed_control()
+        pwm = self.robot.wheel_pwm
+        self.robot.disable_speed_control()
+        self.assertIsNone(self.robot.wheel_pwm)
+        self.assertEqual(pwm.dutycycles(), [0, 0])
@@ -0,0 +1,87 @@
+import random
+from unittest import TestCase
+from unittest.mock import patch
+
+from mock import GPIO
+from mock.ibs import IBS
+from src.cleaning_robot import CleaningRobot
+from src.route_planner import apply_command
+from src.trajectory import Trajectory, MOVED, BLOCKED, LEFT, RIGHT
+
+
+def replay(state, commands):
+    for command in commands:
+        state = apply_command(state, command)
+    return state
+
+
+class TestTrajectory(TestCase):
+
+    def setUp(self):
+        rng = random.Random(7)
+        self.codes = [rng.choice((MOVED, MOVED, MOVED, BLOCKED, LEFT, RIGHT)) for _ in range(1000)]
+        self.full = Trajectory(capacity=2000, checkpoint_interval=16)
+        self.ring = Trajectory(capacity=100, checkpoint_interval=16)
+        for code in self.codes:
+            self.full.record(code)
+            self.ring.record(code)
+
+    def test_records_state(self):
+        trajectory = Trajectory()
+        for code in (MOVED, RIGHT, MOVED, BLOCKED, LEFT):
+            trajectory.record(code)
+        self.assertEqual(list(trajectory), [(0, 0, 'N'), (0, 1, 'N'), (0, 1, 'E'), (1, 1, 'E'), (1, 1, 'E'),
+                                            (1, 1, 'N')])
+        self.assertEqual(trajectory.commands(5), 'frffl')
+
+    def test_ring_keeps_last_steps_in_constant_memory(self):
+        self.assertEqual(len(self.ring), 100)
+        self.assertEqual(len(self.ring.steps), 25)
+        self.assertEqual(list(self.ring), list(self.full)[-101:])
+
+    def test_backwards(self):
+        self.assertEqual(list(self.ring.backwards()), list(self.full)[-101:][::-1])
+
+    def test_state_at(self):
+        states = list(self.full)
+        for steps_back in (0, 1, 15, 16, 17, 99, 100):
+            self.assertEqual(self.ring.state_at(steps_back), states[-1 - steps_back])
+        self.assertRaises(IndexError, self.ring.state_at, 101)
+
+    def test_state_at_with_capacity_below_checkpoint_interval(self):
+        trajectory = Trajectory(capacity=5, checkpoint_interval=64)
+        for code in self.codes[:70]:
+            trajectory.record(code)
+        self.assertEqual(trajectory.state_at(5), list(self.full)[65])
+
+    def test_reverse_commands_go_back_to_past_state(self):
+        current = self.ring.state_at(0)
+        for steps_back in (0, 1, 2, 10, 57, 100):
+            self.assertEqual(replay(current, self.ring.reverse_commands(steps_back)), self.ring.state_at(steps_back))
+
+    def test_reverse_commands(self):
+        trajectory = Trajectory()
+        for code in (MOVED, LEFT, MOVED, BLOCKED):
+            trajectory.record(code)
+        self.assertEqual(trajectory.reverse_commands(4), 'llfrfll')
+        self.assertEqual(trajectory.reverse_commands(1), '')
+        trajectory.record(LEFT)
+        self.assertEqual(trajectory.reverse_commands(1), 'r')
+
+
+class TestCleaningRobotTrajectory(TestCase):
+
+    def setUp(self):
+        setUp_mock_ibs = patch.object(IBS, "get_charge_left", return_value=25)
+        setUp_mock_ibs.start()
+        self.addCleanup(setUp_mock_ibs.stop)
+
+    def test_robot_records_its_steps(self):
+        GPIO.script_input(CleaningRobot.INFRARED_PIN, [False, False, True])
+        self.addCleanup(GPIO.reset)
+        robot = CleaningRobot()
+        robot.initialize_robot()
+        list(robot.execute_commands('frff'))
+        self.assertEqual(robot.trajectory.commands(4), 'frff')
+        self.assertEqual(robot.trajectory.state_at(0), (1, 1, 'E'))
+        self.assertEqual(robot.trajectory.reverse_commands(4), 'llflfll')